@@ -41,6 +41,16 @@ def obtem_estado(g):
     """
     return g[1]
 
+def obtem_dimensao_gerador(g):
+    """
+    Args:
+        g (TAD Gerador): Gerador
+
+    Returns:
+        int: Número de bits do gerador g, 32 ou 64
+    """
+    return g[0]
+
 def define_estado(g,s):
     """Esta função define um novo estado do gerador
 
@@ -133,7 +143,220 @@ def gera_carater_aleatorio(g,c):
     """
     return chr(ord("A") + atualiza_estado(g)%(ord(c)-ord("A")+1))
 
+def atualiza_estados(g,k):
+    """Esta função atualiza k vezes o estado do gerador, obtendo o mesmo
+    resultado que k chamadas a atualiza_estado.
+
+    Args:
+        g (TAD Gerador): Gerador
+        k (int): Número de atualizações
+
+    Returns:
+        tuple: Os k estados seguintes do gerador g, ficando g no último
+    """
+    s,estados=g[1],[]
+    if g[0]==32:
+        for _ in range(k):
+            s ^= (s << 13) & 0xFFFFFFFF
+            s ^= s >> 17
+            s ^= (s << 5) & 0xFFFFFFFF
+            estados.append(s)
+    else:
+        for _ in range(k):
+            s ^= (s << 13) & 0xFFFFFFFFFFFFFFFF
+            s ^= s >> 7
+            s ^= (s << 17) & 0xFFFFFFFFFFFFFFFF
+            estados.append(s)
+    g[1]=s
+    return tuple(estados)
+
+def gera_numeros_aleatorios(g,n,k):
+    """Esta função gera k números aleatórios seguidos, tal como k chamadas
+    a gera_numero_aleatorio
+
+    Args:
+        g (TAD Gerador): Gerador
+        n (int): Número inteiro
+        k (int): Quantidade de números a gerar
+
+    Returns:
+        tuple: k números aleatórios no intervalo [1, n]
+    """
+    return tuple(1 + s % n for s in atualiza_estados(g,k))
+
+def gera_carateres_aleatorios(g,c,k):
+    """Esta função gera k carateres aleatórios seguidos, tal como k chamadas
+    a gera_carater_aleatorio
+
+    Args:
+        g (TAD Gerador): Gerador
+        c (str): Caratér maiúsculo
+        k (int): Quantidade de carateres a gerar
+
+    Returns:
+        tuple: k carateres aleatórios no intervalo entre 'A' e o caráter c
+    """
+    alfabeto="ABCDEFGHIJKLMNOPQRSTUVWXYZ"[:ord(c)-ord("A")+1]
+    return tuple(alfabeto[s % len(alfabeto)] for s in atualiza_estados(g,k))
+
+#O passo do xorshift é uma transformação linear sobre GF(2): uma matriz de b bits
+#é guardada como a lista das suas b colunas (inteiros de b bits)
+potencias_xorshift={32:[],64:[]} #potencias_xorshift[b][j] é a matriz do passo elevada a 2**j
+
+def aplica_matriz(matriz,v):
+    """
+    Args:
+        matriz (list): Colunas de uma matriz sobre GF(2)
+        v (int): Vetor de bits
+
+    Returns:
+        int: Produto da matriz pelo vetor v
+    """
+    res,j=0,0
+    while v:
+        if v & 1:
+            res^=matriz[j]
+        v>>=1
+        j+=1
+    return res
+
+def obtem_potencia_xorshift(b,j):
+    """
+    Args:
+        b (int): Numero de bits do gerador
+        j (int): Expoente
+
+    Returns:
+        list: Matriz que avança 2**j estados de um gerador de b bits
+    """
+    potencias=potencias_xorshift[b]
+    if not potencias:
+        potencias.append([atualiza_estado([b,1<<i]) for i in range(b)])
+    while len(potencias)<=j:
+        anterior=potencias[-1]
+        potencias.append([aplica_matriz(anterior,coluna) for coluna in anterior])
+    return potencias[j]
+
+def calcula_avanco(b,s,k):
+    """
+    Args:
+        b (int): Numero de bits do gerador
+        s (int): Estado
+        k (int): Número de passos
+
+    Returns:
+        int: Estado obtido ao avançar k passos a partir do estado s
+    """
+    j=0
+    while k:
+        if k & 1:
+            s=aplica_matriz(obtem_potencia_xorshift(b,j),s)
+        k>>=1
+        j+=1
+    return s
+
+def avanca_estado(g,k):
+    """Esta função avança o estado do gerador k passos de uma só vez,
+    com O(log k) produtos de matrizes pré-calculadas.
+
+    Args:
+        g (TAD Gerador): Gerador
+        k (int): Número de passos
+
+    Raises:
+        ValueError: Levanta erro se k não for um inteiro não negativo
+
+    Returns:
+        int: Estado do gerador g igual ao obtido com k chamadas a atualiza_estado
+    """
+    if not (type(k)==int and k>=0):
+        raise ValueError ("avanca_estado: argumentos invalidos")
+    return define_estado(g,calcula_avanco(g[0],g[1],k))
+
+def divide_gerador(g,n):
+    """Esta função divide a sequência do gerador g em n subsequências
+    disjuntas, cada uma com (2**b-1)//n estados, sem alterar g.
+
+    Args:
+        g (TAD Gerador): Gerador
+        n (int): Número de subsequências
+
+    Raises:
+        ValueError: Levanta erro se n não for um inteiro positivo
+
+    Returns:
+        tuple: n geradores, o primeiro igual a g e cada um dos seguintes
+        avançado (2**b-1)//n passos em relação ao anterior
+    """
+    if not (type(n)==int and 1<=n<=(2**g[0])-1):
+        raise ValueError ("divide_gerador: argumentos invalidos")
+    geradores=[cria_copia_gerador(g)]
+    salto=[calcula_avanco(g[0],1<<i,((2**g[0])-1)//n) for i in range(g[0])] #matriz do salto
+    for _ in range(n-1):
+        geradores.append(cria_gerador(g[0],aplica_matriz(salto,obtem_estado(geradores[-1]))))
+    return tuple(geradores)
+
 #TAD coordenada-Representação interna: (col,lin)    
+#As colunas são identificadas como numa folha de cálculo: A a Z, depois AA a AZ,
+#BA a BZ, ..., ZZ, AAA, e as linhas não têm limite.
+#As coordenadas das colunas A a Z e linhas 1 a 99 são criadas uma única vez e
+#reutilizadas, tal como os tuplos das suas coordenadas vizinhas
+#coordenadas_internas[col][lin] é a coordenada (col,lin). A tabela é criada aqui,
+#e não no primeiro uso, para poder ser lida por várias threads ao mesmo tempo.
+coordenadas_internas={chr(ord("A")+j):(None,)+tuple((chr(ord("A")+j),i) for i in range(1,100)) for j in range(26)}
+vizinhas_internas={} #vizinhas_internas[c] são as coordenadas vizinhas de c
+
+def coluna_para_numero(col):
+    """
+    Args:
+        col (str): Coluna
+
+    Returns:
+        int: Número da coluna, a começar em 1 ("A" é 1, "Z" é 26 e "AA" é 27)
+    """
+    numero=0
+    for letra in col:
+        numero=numero*26+ord(letra)-ord("A")+1
+    return numero
+
+def numero_para_coluna(numero):
+    """
+    Args:
+        numero (int): Número de uma coluna, a começar em 1
+
+    Returns:
+        str: Coluna com esse número
+    """
+    coluna=""
+    while numero>0:
+        numero,resto=divmod(numero-1,26)
+        coluna=chr(ord("A")+resto)+coluna
+    return coluna
+
+def eh_nome_coluna(arg):
+    """
+    Args:
+        arg (universal): Argumento universal
+
+    Returns:
+        bool: True se arg é uma cadeia não vazia de letras maiúsculas de A a Z
+    """
+    return type(arg)==str and arg!="" and arg.isascii() and arg.isalpha() and arg.isupper()
+
+def obtem_coordenada_interna(col,lin):
+    """
+    Args:
+        col (str): Coluna
+        lin (int): Linha
+
+    Returns:
+        TAD coordenada: Coordenada (col,lin), da tabela de coordenadas se a
+        coluna estiver entre A e Z e a linha no intervalo [1,99]
+    """
+    if len(col)>1 or lin>99:
+        return (col,lin)
+    return coordenadas_internas[col][lin]
+
 def cria_coordenada(col,lin):
     """ Esta função recebe os valores correspondentes à coluna col e
     linha lin e devolve a coordenada correspondente.
@@ -143,16 +366,15 @@ def cria_coordenada(col,lin):
         lin (int): Linha
 
     Raises:
-        ValueError: Levanta erro se col não for uma string e não estiver 
-        entre A e Z; e se lin não for inteiro no intervalo [1,99]
+        ValueError: Levanta erro se col não for uma string de letras
+        entre A e Z; e se lin não for um inteiro positivo
 
     Returns:
         TAD coordenada: Coordenada
     """
-    if not(type(col)==str and type(lin)==int and len(col)==1 \
-        and 1<=lin<=99 and 65<=ord(col)<=90):
+    if not(eh_nome_coluna(col) and type(lin)==int and 1<=lin):
         raise ValueError ("cria_coordenada: argumentos invalidos")
-    return (col,lin)
+    return obtem_coordenada_interna(col,lin)
 
 def obtem_coluna(c):
     """
@@ -184,9 +406,8 @@ def eh_coordenada(arg):
         bool: True caso o seu argumento seja um TAD coordenada e
         False caso contrário
     """
-    return type(arg)==tuple and len(arg)==2 and type(arg[0])==str \
-        and len(arg[0])==1 and type(arg[1])==int and 1<=arg[1]<=99 \
-            and 65<=ord(arg[0])<=90
+    return type(arg)==tuple and len(arg)==2 and eh_nome_coluna(arg[0]) \
+        and type(arg[1])==int and 1<=arg[1]
 
 def coordenadas_iguais(c1,c2):
     """
@@ -219,7 +440,8 @@ def str_para_coordenada(s):
     Returns:
         TAD coordenada: Coordenada
     """
-    return (s[0],int(s[1:]))
+    k=len(s)-len(s.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) #comprimento da coluna
+    return (s[:k],int(s[k:]))
 
 def obtem_coordenadas_vizinhas(c):
     """Esta função devolve um tuplo com as coordenadas vizinhas à
@@ -232,27 +454,42 @@ def obtem_coordenadas_vizinhas(c):
         tuple: Coordenadas vizinhas à coordenada c, começando pela coordenada na 
         diagonal acima-esquerda de c e seguindo no sentido horário
     """
+    if c in vizinhas_internas:
+        return vizinhas_internas[c]
+    if not eh_coordenada(c) or len(obtem_coluna(c))>1 or obtem_linha(c)>99:
+        return calcula_coordenadas_vizinhas(c)
+    vizinhas_internas[obtem_coordenada_interna(obtem_coluna(c),obtem_linha(c))]=\
+        calcula_coordenadas_vizinhas(c)
+    return vizinhas_internas[c]
+
+def calcula_coordenadas_vizinhas(c):
+    """
+    Args:
+        c (TAD coordenada): Coordenada
+
+    Returns:
+        tuple: Coordenadas vizinhas à coordenada c pela ordem de
+        obtem_coordenadas_vizinhas, calculadas sem a tabela
+    """
     coord_vizinhas=()
+    coluna=coluna_para_numero(obtem_coluna(c))
+    esquerda,direita=numero_para_coluna(coluna-1),numero_para_coluna(coluna+1)
 
-    if 1<=obtem_linha(c)-1<=99:
-        if ord("A")<=ord(obtem_coluna(c))-1<=ord("Z"):
-            coord_vizinhas+=(cria_coordenada(chr(ord(obtem_coluna(c))-1),obtem_linha(c)-1),) #adiciona a coordenada na diagonal acima-esquerda de c
-        coord_vizinhas+=(cria_coordenada(obtem_coluna(c),obtem_linha(c)-1),)                 #adiciona a coordenada acima de c
-
-    if ord("A")<=ord(obtem_coluna(c))+1<=ord("Z"):
-        if 1<=obtem_linha(c)-1<=99:
-            coord_vizinhas+=(cria_coordenada(chr(ord(obtem_coluna(c))+1),obtem_linha(c)-1),) #adiciona a coordenada na diagonal acima-direita de c
-        coord_vizinhas+=(cria_coordenada(chr(ord(obtem_coluna(c))+1),obtem_linha(c)),)       #adiciona a coordenada à direita de c
-
-    if 1<=obtem_linha(c)+1<=99:
-        if ord("A")<=ord(obtem_coluna(c))+1<=ord("Z"):
-            coord_vizinhas+=(cria_coordenada(chr(ord(obtem_coluna(c))+1),obtem_linha(c)+1),) #adiciona a coordenada na diagonal abaixo-direita de c
-        coord_vizinhas+=(cria_coordenada(obtem_coluna(c),obtem_linha(c)+1),)                 #adiciona a coordenada abaixo de c
-        
-    if ord("A")<=ord(obtem_coluna(c))-1<=ord("Z"):
-        if 1<=obtem_linha(c)+1<=99:
-            coord_vizinhas+=(cria_coordenada(chr(ord(obtem_coluna(c))-1),obtem_linha(c)+1),) #adiciona a coordenada na diagonal abaixo-esquerda de c
-        coord_vizinhas+=(cria_coordenada(chr(ord(obtem_coluna(c))-1),obtem_linha(c)),)       #adiciona a coordenada à esquerda de c
+    if 1<=obtem_linha(c)-1:
+        if 1<=coluna-1:
+            coord_vizinhas+=(cria_coordenada(esquerda,obtem_linha(c)-1),)           #adiciona a coordenada na diagonal acima-esquerda de c
+        coord_vizinhas+=(cria_coordenada(obtem_coluna(c),obtem_linha(c)-1),)     #adiciona a coordenada acima de c
+
+    if 1<=obtem_linha(c)-1:
+        coord_vizinhas+=(cria_coordenada(direita,obtem_linha(c)-1),)             #adiciona a coordenada na diagonal acima-direita de c
+    coord_vizinhas+=(cria_coordenada(direita,obtem_linha(c)),)                   #adiciona a coordenada à direita de c
+
+    coord_vizinhas+=(cria_coordenada(direita,obtem_linha(c)+1),)                 #adiciona a coordenada na diagonal abaixo-direita de c
+    coord_vizinhas+=(cria_coordenada(obtem_coluna(c),obtem_linha(c)+1),)         #adiciona a coordenada abaixo de c
+
+    if 1<=coluna-1:
+        coord_vizinhas+=(cria_coordenada(esquerda,obtem_linha(c)+1),)            #adiciona a coordenada na diagonal abaixo-esquerda de c
+        coord_vizinhas+=(cria_coordenada(esquerda,obtem_linha(c)),)              #adiciona a coordenada à esquerda de c
 
     return coord_vizinhas
 
@@ -267,17 +504,43 @@ def obtem_coordenada_aleatoria(c,g):
     Returns:
         tuple: Coordenada gerada aleatoriamente
     """
-    return cria_coordenada(gera_carater_aleatorio(g,obtem_coluna(c)),\
-        gera_numero_aleatorio(g,obtem_linha(c)))
+    return cria_coordenada(numero_para_coluna(gera_numero_aleatorio(g,coluna_para_numero(obtem_coluna(c)))),\
+        gera_numero_aleatorio(g,obtem_linha(c))) #o mesmo que gera_carater_aleatorio até à coluna Z
+
+#TAD parcela-Representação interna: [campo,indice]
+#A parcela é uma vista sobre o byte da posição indice do campo, cujos bits
+#indicam se a parcela está minada, tapada, marcada ou limpa. Os 4 bits mais
+#significativos guardam o número de minas nas parcelas vizinhas.
+MINADA,TAPADA,MARCADA,LIMPA=1,2,4,8
+ESTADOS=TAPADA|MARCADA|LIMPA
+BITS_ESTADOS={"tapadas":TAPADA,"marcadas":MARCADA,"limpas":LIMPA,"minadas":MINADA}
+TABELA_ESTADOS_INVALIDOS=bytes(0 if parcela & ESTADOS in (TAPADA,MARCADA,LIMPA) else 1 for parcela in range(256))
+#As funções públicas validam os seus argumentos; os percursos internos (limpeza
+#em cascata, colocação de minas, jogadas) leem os bytes das parcelas sem os
+#validar, exceto em modo de depuração
+DEPURACAO=False
+
+def define_depuracao(ativa):
+    """Esta função liga ou desliga o modo de depuração, em que os percursos
+    internos também validam os seus argumentos com as funções eh_*
+
+    Args:
+        ativa (bool): True para ligar o modo de depuração
+
+    Returns:
+        bool: Valor anterior do modo de depuração
+    """
+    global DEPURACAO
+    anterior,DEPURACAO=DEPURACAO,ativa
+    return anterior
 
-#TAD parcela-Representação interna: {"estado":"tapadas","minada":False}
 def cria_parcela():
     """Esta função cria uma parcela
 
     Returns:
         TAD parcela: Parcela tapada sem mina escondida
     """
-    p={"estado":"tapadas","minada":False}
+    p=[inicializa_campo(1,1),0]
     return p
 
 def cria_copia_parcela(p):
@@ -286,51 +549,79 @@ def cria_copia_parcela(p):
         p (TAD parcela): Parcela
 
     Returns:
-        dict: Nova cópia da parcela
+        list: Nova cópia da parcela
     """
-    p1={}
-    for chave in p :
-        p1[chave] = p[chave]
+    p1=cria_parcela()
+    p1[0]["parcelas"][0]=p[0]["parcelas"][p[1]] & (ESTADOS|MINADA)
     return p1
 
+def altera_estado(m,i,estado):
+    """Esta função modifica destrutivamente o estado da parcela na posição
+    i do campo m. Todas as mudanças de estado das parcelas passam por aqui.
+
+    Args:
+        m (TAD campo): Campo
+        i (int): Posição da parcela no bytearray do campo m
+        estado (int): TAPADA, MARCADA ou LIMPA
+    """
+    if DEPURACAO and not (eh_parcela([m,i]) and estado in (TAPADA,MARCADA,LIMPA)):
+        raise ValueError ("altera_estado: argumentos invalidos")
+    parcelas=m["parcelas"]
+    antigo=parcelas[i]
+    parcelas[i]=(antigo & ~ESTADOS) | estado
+    if m["diario"] is not None:
+        m["diario"].append((i,antigo,parcelas[i]))
+    atualiza_indices(m,i,antigo,parcelas[i])
+
+def altera_estado_parcela(p,estado):
+    """Esta função modifica destrutivamente o estado da parcela p,
+    mantendo a mina e o número de minas vizinhas
+
+    Args:
+        p (TAD parcela): Parcela
+        estado (int): TAPADA, MARCADA ou LIMPA
+
+    Returns:
+        list: Parcela modificada
+    """
+    altera_estado(p[0],p[1],estado)
+    return p
+
 def limpa_parcela(p):
-    """Esta função modifica destrutivamente a parcela p modificando o 
+    """Esta função modifica destrutivamente a parcela p modificando o
     seu estado para limpa
 
     Args:
         p (TAD parcela): Parcela
 
     Returns:
-        dict: Parcela limpa
+        list: Parcela limpa
     """
-    p["estado"]="limpas"
-    return p
+    return altera_estado_parcela(p,LIMPA)
 
 def marca_parcela(p):
-    """Esta função modifica destrutivamente a parcela p modificando o 
+    """Esta função modifica destrutivamente a parcela p modificando o
     seu estado para marcada com uma bandeira
 
     Args:
         p (TAD parcela): Parcela
 
     Returns:
-        dict: Parcela Marcada
+        list: Parcela Marcada
     """
-    p["estado"]="marcadas"
-    return p
+    return altera_estado_parcela(p,MARCADA)
 
 def desmarca_parcela(p):
-    """Esta função modifica destrutivamente a parcela p modificando o 
+    """Esta função modifica destrutivamente a parcela p modificando o
     seu estado para tapada
 
     Args:
         p (TAD parcela): Parcela
 
     Returns:
-        dict: Parcela tapada
+        list: Parcela tapada
     """
-    p["estado"]="tapadas"
-    return p
+    return altera_estado_parcela(p,TAPADA)
 
 def esconde_mina(p):
     """Esta função modifica destrutivamente a parcela p escondendo uma
@@ -340,9 +631,20 @@ def esconde_mina(p):
         p (TAD parcela): Parcela
 
     Returns:
-        dict: Parcela minada
-    """
-    p["minada"]=True
+        list: Parcela minada
+    """
+    if DEPURACAO and not eh_parcela(p):
+        raise ValueError ("esconde_mina: argumentos invalidos")
+    parcelas,diario=p[0]["parcelas"],p[0]["diario"]
+    if not parcelas[p[1]] & MINADA:
+        parcelas[p[1]]|=MINADA
+        atualiza_indices(p[0],p[1],parcelas[p[1]] & ~MINADA,parcelas[p[1]])
+        if diario is not None:
+            diario.append((p[1],parcelas[p[1]] & ~MINADA,parcelas[p[1]]))
+        for i in obtem_indices_vizinhos(p[0],p[1]): #atualiza a contagem das parcelas vizinhas
+            parcelas[i]+=16
+            if diario is not None:
+                diario.append((i,parcelas[i]-16,parcelas[i]))
     return p
 
 def eh_parcela(arg):
@@ -354,10 +656,10 @@ def eh_parcela(arg):
         bool: True caso o seu argumento seja um TAD parcela e
         False caso contrário
     """
-    return type(arg)==dict and "estado" in arg and "minada" in  arg \
-        and len(list(arg.values()))==2 and type(arg["minada"])==bool \
-            and type(arg["estado"])==str and ("tapadas" in arg["estado"] or\
-                "marcadas" in arg["estado"] or "limpas" in arg["estado"])
+    return type(arg)==list and len(arg)==2 and type(arg[0])==dict \
+        and type(arg[0].get("parcelas"))==bytearray and type(arg[1])==int \
+            and 0<=arg[1]<len(arg[0]["parcelas"]) \
+                and arg[0]["parcelas"][arg[1]] & ESTADOS in (TAPADA,MARCADA,LIMPA)
 
 def eh_parcela_tapada(p):
     """
@@ -368,7 +670,7 @@ def eh_parcela_tapada(p):
         bool: True caso a parcela p se encontre tapada e False
         caso contrário
     """
-    return eh_parcela(p) and "tapadas" in p["estado"]
+    return eh_parcela(p) and p[0]["parcelas"][p[1]] & TAPADA!=0
 
 def eh_parcela_marcada(p):
     """
@@ -376,10 +678,10 @@ def eh_parcela_marcada(p):
         p (TAD parcela): Parcela
 
     Returns:
-        bool: True caso a parcela p se encontre marcada com 
+        bool: True caso a parcela p se encontre marcada com
         uma bandeira e False caso contrário
     """
-    return eh_parcela(p) and "marcadas" in p["estado"]
+    return eh_parcela(p) and p[0]["parcelas"][p[1]] & MARCADA!=0
 
 def eh_parcela_limpa(p):
     """
@@ -390,7 +692,7 @@ def eh_parcela_limpa(p):
         bool: True caso a parcela p se encontre limpa e False
         caso contrário
     """
-    return eh_parcela(p) and "limpas" in p["estado"]
+    return eh_parcela(p) and p[0]["parcelas"][p[1]] & LIMPA!=0
 
 def eh_parcela_minada(p):
     """
@@ -401,7 +703,7 @@ def eh_parcela_minada(p):
         bool: True caso a parcela p esconda uma mina e False
         caso contrário
     """
-    return eh_parcela(p) and p["minada"]
+    return eh_parcela(p) and p[0]["parcelas"][p[1]] & MINADA!=0
 
 def parcelas_iguais(p1,p2):
     """
@@ -412,7 +714,8 @@ def parcelas_iguais(p1,p2):
     Returns:
         bool: True apenas se p1 e p2 são parcelas e são iguais
     """
-    return eh_parcela(p1) and eh_parcela(p2) and p1==p2
+    return eh_parcela(p1) and eh_parcela(p2) and p1[0]["parcelas"][p1[1]] & (ESTADOS|MINADA)\
+        ==p2[0]["parcelas"][p2[1]] & (ESTADOS|MINADA)
 
 def parcela_para_str(p):
     """Esta função transforma uma parcela numa cadeia de caracteres
@@ -444,13 +747,126 @@ def alterna_bandeira(p):
     """
     p1=cria_copia_parcela(p)
     if eh_parcela_marcada(p):
-        return p1 != desmarca_parcela(p)
+        return not parcelas_iguais(p1,desmarca_parcela(p))
     elif eh_parcela_tapada(p):
-        return p1 != marca_parcela(p)
+        return not parcelas_iguais(p1,marca_parcela(p))
     else:
-        return p1!=p
+        return not parcelas_iguais(p1,p)
+
+def alterna_bandeira_indice(m,i):
+    """Esta função modifica destrutivamente a parcela na posição i do
+    campo m tal como alterna_bandeira, sem criar parcelas
+
+    Args:
+        m (TAD campo): Campo
+        i (int): Posição da parcela no bytearray do campo m
+
+    Returns:
+        bool: Se modifica a parcela devolve True e caso contrário False
+    """
+    parcela=m["parcelas"][i]
+    if parcela & MARCADA:
+        altera_estado(m,i,TAPADA)
+    elif parcela & TAPADA:
+        altera_estado(m,i,MARCADA)
+    return not parcela & LIMPA
+
+#TAD campo-Representação interna: {"colunas":int,"linhas":int,"parcelas":bytearray,
+#"contagens":dict,"indices":dict,"ordenadas":dict,"linhas_str":list,"linhas_alteradas":set,
+#"diario":list,"hash":int,"observadores":list,"alteradas":dict}
+#As parcelas são guardadas linha a linha num bytearray com um byte por parcela.
+#As contagens de parcelas em cada estado são mantidas a cada alteração; os
+#conjuntos de posições em cada estado só são criados quando pedidos a
+#obtem_coordenadas, e a partir daí mantidos, tal como o tuplo ordenado devolvido.
+#Do mesmo modo, campo_para_str guarda as linhas representadas e as linhas
+#alteradas desde então.
+#Depois de obtem_marca_campo, cada byte alterado é acrescentado ao diário como
+#(posição, byte antigo, byte novo), o que permite voltar a uma marca desfazendo
+#só as alterações feitas desde então.
+#O hash é o XOR das chaves de Zobrist de todas as parcelas e é atualizado a
+#cada alteração. Parcelas tapadas sem mina têm chave 0, pelo que um campo
+#novo tem hash 0.
+#Enquanto houver observadores, "alteradas" guarda o byte que cada parcela
+#alterada tinha antes da jogada, para emite_alteracoes só lhes enviar as
+#parcelas cujo símbolo mudou.
+def inicializa_campo(colunas,linhas):
+    """
+    Args:
+        colunas (int): Número de colunas
+        linhas (int): Número de linhas
+
+    Returns:
+        TAD campo: Campo com estas dimensões formado por parcelas
+        tapadas sem minas
+    """
+    n=colunas*linhas
+    return {"colunas":colunas,"linhas":linhas,"parcelas":bytearray((TAPADA,))*n,\
+        "contagens":{"tapadas":n,"marcadas":0,"limpas":0,"minadas":0,"por_limpar":n},\
+            "indices":{},"ordenadas":{},"linhas_str":None,"linhas_alteradas":set(),"diario":None,\
+                "hash":0,"observadores":[],"alteradas":None}
+
+def mistura_splitmix(x):
+    """
+    Args:
+        x (int): Inteiro de 64 bits
+
+    Returns:
+        int: Inteiro de 64 bits obtido de x com a função de mistura do splitmix64
+    """
+    x=((x ^ (x>>30))*0xbf58476d1ce4e5b9) & 0xffffffffffffffff
+    x=((x ^ (x>>27))*0x94d049bb133111eb) & 0xffffffffffffffff
+    return x ^ (x>>31)
+
+def chave_zobrist(i,parcela):
+    """
+    Args:
+        i (int): Posição de uma parcela
+        parcela (int): Byte da parcela
+
+    Returns:
+        int: Chave de 64 bits da parcela na posição i com o estado e a mina
+        de parcela, obtida com a função de mistura do splitmix64
+    """
+    parcela&=ESTADOS|MINADA
+    if parcela==TAPADA:
+        return 0
+    return mistura_splitmix((i*16+parcela+0x9e3779b97f4a7c15) & 0xffffffffffffffff)
+
+def atualiza_indices(m,i,antigo,novo):
+    """Esta função atualiza as contagens e os índices de estados do campo m
+    quando a parcela na posição i muda do byte antigo para o byte novo
+
+    Args:
+        m (TAD campo): Campo
+        i (int): Posição da parcela no bytearray do campo m
+        antigo (int): Byte da parcela antes da alteração
+        novo (int): Byte da parcela depois da alteração
+    """
+    contagens,indices=m["contagens"],m["indices"]
+    if m["linhas_str"] is not None: #linhas a voltar a representar em campo_para_str
+        y=i//m["colunas"]
+        if (antigo ^ novo) & MINADA: #muda também o número das parcelas vizinhas
+            m["linhas_alteradas"].update(range(max(y-1,0),min(y+2,m["linhas"])))
+        else:
+            m["linhas_alteradas"].add(y)
+    if m["alteradas"] is not None and i not in m["alteradas"]:
+        m["alteradas"][i]=antigo
+    for s,bit in BITS_ESTADOS.items():
+        if antigo & bit and not novo & bit:
+            contagens[s]-=1
+            if s in indices:
+                indices[s].discard(i)
+                m["ordenadas"].pop(s,None)
+        elif novo & bit and not antigo & bit:
+            contagens[s]+=1
+            if s in indices:
+                indices[s].add(i)
+                m["ordenadas"].pop(s,None)
+    #parcelas sem mina que ainda não foram limpas
+    contagens["por_limpar"]+=(not novo & (MINADA|LIMPA))-(not antigo & (MINADA|LIMPA))
+    if (antigo ^ novo) & (ESTADOS|MINADA):
+        m["hash"]^=chave_zobrist(i,antigo) ^ chave_zobrist(i,novo)
 
-#TAD campo-Representação interna: {TAD coordenada: TAD parcela}
 def cria_campo(c,l):
     """Esta função cria um campo
 
@@ -459,22 +875,18 @@ def cria_campo(c,l):
         l (int): Última linha de um campo de minas
 
     Raises:
-        ValueError: Levanta erro se o tipo de c não é string e se
-        o tipo de l não é inteiro
+        ValueError: Levanta erro se c não é uma coluna e se l não é
+        um inteiro positivo
 
     Returns:
-        TAD campo: Campo do tamanho pretendido formado por parcelas 
+        TAD campo: Campo do tamanho pretendido formado por parcelas
         tapadas sem minas
     """
-    if not (type(c)==str and type(l)==int and len(c)==1 and 65<=ord(c)<=90 and 1<=l<=99):
+    if not (eh_nome_coluna(c) and type(l)==int and 1<=l):
         raise ValueError ("cria_campo: argumentos invalidos")
-    m={}
-    al="ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    for j in range(al.find(c)+1):
-        for i in range(1,l+1):
-            m[cria_coordenada(al[j],i)]=cria_parcela()
+    m=inicializa_campo(coluna_para_numero(c),l)
     return m
-    
+
 def cria_copia_campo(m):
     """
     Args:
@@ -483,276 +895,1108 @@ def cria_copia_campo(m):
     Returns:
         dict: Nova cópia do campo
     """
-    m1={}
-    for c in m:
-        m1[c]=cria_copia_parcela(obtem_parcela(m,c))
+    m1={"colunas":m["colunas"],"linhas":m["linhas"],"parcelas":m["parcelas"][:],\
+        "contagens":dict(m["contagens"]),"indices":{},"ordenadas":{},\
+            "linhas_str":None,"linhas_alteradas":set(),"diario":None,"hash":m["hash"],\
+                "observadores":[],"alteradas":None}
     return m1
 
-def obtem_ultima_coluna(m):
-    """
+def obtem_marca_campo(m):
+    """Esta função marca o estado atual do campo m, para lhe voltar com
+    desfaz_campo. Não copia o campo: a partir da primeira marca, cada
+    alteração do campo é guardada no seu diário.
+
     Args:
         m (TAD campo): Campo
 
     Returns:
-        str: Cadeia de caracteres que corresponde à
-        última coluna do campo de minas
+        int: Marca do estado atual do campo
     """
-    return obtem_coluna(list(m.keys())[-1])
+    if m["diario"] is None:
+        m["diario"]=[]
+    return len(m["diario"])
+
+def desfaz_campo(m,marca):
+    """Esta função modifica destrutivamente o campo m, desfazendo as
+    alterações feitas depois da marca
 
-def obtem_ultima_linha(m):
-    """
     Args:
         m (TAD campo): Campo
+        marca (int): Marca de obtem_marca_campo
 
     Returns:
-        str: Cadeia de caracteres que corresponde à
-        última linha do campo de minas
+        list: Alterações desfeitas, pela ordem em que foram feitas, que
+        podem ser refeitas com refaz_campo
     """
-    return obtem_linha(list(m.keys())[-1])
+    parcelas,diario=m["parcelas"],m["diario"]
+    alteracoes=diario[marca:]
+    del diario[marca:]
+    for i,antigo,novo in reversed(alteracoes):
+        parcelas[i]=antigo
+        atualiza_indices(m,i,novo,antigo)
+    return alteracoes
+
+def refaz_campo(m,alteracoes):
+    """Esta função modifica destrutivamente o campo m, voltando a fazer
+    as alterações desfeitas por desfaz_campo
 
-def obtem_parcela(m, c):
-    """
     Args:
         m (TAD campo): Campo
-        c (TAD coordenada): Coordenada
-
-    Returns:
-        dict: Parcela do campo m que se encontra na coordenada c
+        alteracoes (list): Alterações de desfaz_campo
     """
-    return m[c]
+    parcelas=m["parcelas"]
+    for i,antigo,novo in alteracoes:
+        parcelas[i]=novo
+        atualiza_indices(m,i,antigo,novo)
+    obtem_marca_campo(m)
+    m["diario"].extend(alteracoes)
 
-def obtem_coordenadas(m,s):
-    """Esta função devolve o tuplo formado pelas coordenadas ordenadas 
-    em ordem ascendente de esquerda à direita e de cima a baixo das parcelas
-    dependendo do valor de s
+def adiciona_observador(m,observador):
+    """Esta função regista um observador das alterações do campo m. Depois
+    de cada jogada, o observador recebe o lote das parcelas cujo símbolo
+    mudou, tal como devolvido por emite_alteracoes.
 
     Args:
         m (TAD campo): Campo
-        s (str): Estado inicial
+        observador (function): Função que recebe uma lista de alterações
+    """
+    if m["alteradas"] is None:
+        m["alteradas"]={}
+    m["observadores"].append(observador)
 
-    Returns:
-        tuple: Tuplo de coordenadas
+def remove_observador(m,observador):
     """
-    res=()
-    for c in m:
-        if (s=="tapadas" and eh_parcela_tapada(obtem_parcela(m,c))) or\
-            (s=="marcadas" and eh_parcela_marcada(obtem_parcela(m,c))) or\
-                (s=="limpas" and eh_parcela_limpa(obtem_parcela(m,c))) or\
-                    (s=="minadas" and eh_parcela_minada(obtem_parcela(m,c))):
-                    res+=(c,)
-    return tuple(sorted(res, key=lambda c: (obtem_linha(c), obtem_coluna(c))))
+    Args:
+        m (TAD campo): Campo
+        observador (function): Observador registado com adiciona_observador
 
-def obtem_numero_minas_vizinhas(m,c):
+    Raises:
+        ValueError: Levanta erro se o observador não estiver registado
     """
+    if observador not in m["observadores"]:
+        raise ValueError ("remove_observador: argumentos invalidos")
+    m["observadores"].remove(observador)
+    if not m["observadores"]:
+        m["alteradas"]=None
+
+def emite_alteracoes(m):
+    """Esta função envia aos observadores do campo m as parcelas alteradas
+    desde a última emissão, uma só vez cada uma e só se o seu símbolo em
+    campo_para_str mudou. Uma bandeira posta e tirada na mesma jogada, ou uma
+    mina escondida numa parcela tapada, não produzem alterações.
+
     Args:
         m (TAD campo): Campo
-        c (TAD coordenada): Coordenada
 
     Returns:
-        int: Número de parcelas vizinhas da parcela na 
-        coordenada c que escondem uma mina
-    """
-    contador=0
-    for coordenada in m:
-        if eh_parcela_minada(obtem_parcela(m,coordenada))\
-            and coordenada in obtem_coordenadas_vizinhas(c):
-            contador+=1
-    return contador
+        list: Alterações emitidas, por ordem das parcelas, cada uma com a
+        coordenada, o novo símbolo e o número de minas vizinhas se a parcela
+        está limpa, ou None caso contrário
+    """
+    if not m["alteradas"]:
+        return []
+    parcelas,lote=m["parcelas"],[]
+    for i in sorted(m["alteradas"]):
+        antigo,novo=m["alteradas"][i],parcelas[i]
+        if TABELA_SIMBOLOS[antigo]!=TABELA_SIMBOLOS[novo]:
+            lote.append((obtem_coordenada_indice(m,i),chr(TABELA_SIMBOLOS[novo]),\
+                novo>>4 if novo & LIMPA else None))
+    m["alteradas"]={}
+    if lote:
+        for observador in m["observadores"]:
+            observador(lote)
+    return lote
 
-def eh_campo(arg):
+def obtem_ultima_coluna(m):
     """
     Args:
-        arg (universal): Argumento Universal
+        m (TAD campo): Campo
 
     Returns:
-        bool: True caso o seu argumento seja um TAD campo e
-        False caso contrário.
+        str: Cadeia de caracteres que corresponde à
+        última coluna do campo de minas
     """
-    return type(arg)==dict and len(arg)>=1 and all([eh_coordenada(chave)\
-        for chave in list(arg.keys())]) and all([eh_parcela(valores)\
-            for valores in list(arg.values())])
+    return numero_para_coluna(m["colunas"])
 
-def eh_coordenada_do_campo(m,c):
+def obtem_ultima_linha(m):
     """
     Args:
         m (TAD campo): Campo
-        c (TAD coordenada): Coordenada
 
     Returns:
-        bool: True se c é uma coordenada válida dentro do campo m
+        str: Cadeia de caracteres que corresponde à
+        última linha do campo de minas
     """
-    return eh_coordenada(c) and c in m
+    return m["linhas"]
 
-def campos_iguais(m1,m2):
+def obtem_parcelas_campo(m):
     """
     Args:
-        m1 (TAD campo): Campo 1
-        m2 (TAD campo): Campo 2
+        m (TAD campo): Campo
 
     Returns:
-        bool: True apenas se m1 e m2 forem campos e
-        forem iguais
+        bytes: Cópia dos bytes das parcelas do campo m, linha a linha, com
+        os bits MINADA, TAPADA, MARCADA e LIMPA e o número de minas vizinhas
+        nos 4 bits mais altos
     """
-    sao_iguais = False
-    if eh_campo(m1) and eh_campo(m2) and len(m1) == len(m2):
-        m1_keys,m2_keys = sorted(list(m1.keys())),sorted(list(m2.keys()))
-        for i in range(len(m2_keys)):
-            if not coordenadas_iguais(m1_keys[i], m2_keys[i]):
-                return sao_iguais 
-        for coordenada in m2:   
-            if not parcelas_iguais(obtem_parcela(m1, coordenada),obtem_parcela(m2, coordenada)):
-                return sao_iguais
-        sao_iguais = True
-        return sao_iguais
-    return sao_iguais
-
-def campo_para_str_aux(m,lst):
-    if lst == []:
-        return ""
-    elif parcela_para_str(obtem_parcela(m,lst[0]))=="?" and\
-        obtem_numero_minas_vizinhas(m,lst[0])!=0:
-        return "%d"%(obtem_numero_minas_vizinhas(m,lst[0])) + campo_para_str_aux(m,lst[1:]) 
-    elif parcela_para_str(obtem_parcela(m,lst[0]))=="?" and\
-        obtem_numero_minas_vizinhas(m,lst[0])==0: 
-        return " " + campo_para_str_aux(m,lst[1:])
-    else:
-        return parcela_para_str(obtem_parcela(m,lst[0])) + campo_para_str_aux(m,lst[1:])
-
-def campo_para_str(m):
-    """Esta função devolve a representação do campo em cadeia de carateres
+    return bytes(m["parcelas"])
 
+def obtem_bytes_campo(m):
+    """
     Args:
         m (TAD campo): Campo
 
     Returns:
-        str: Cadeia de caracteres que representa o campo de minas
+        bytearray: Bytes das parcelas do campo m, como em obtem_parcelas_campo
+        mas sem cópia, para os ciclos que só os leem. O campo só é alterado
+        através de altera_estado, esconde_mina e soma_mina_vizinha.
     """
-    alfabeto="ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-    meio=""
-    inicio=("   %s\n  " + "+" + "-"*len(alfabeto[:alfabeto.find(obtem_ultima_coluna(m))+1]) + "+\n")\
-        %(alfabeto[:alfabeto.find(obtem_ultima_coluna(m))+1])
-    fim = "  +" + "-"*len(alfabeto[:alfabeto.find(obtem_ultima_coluna(m))+1]) + "+"
-    for i in range(1,obtem_ultima_linha(m)+1):
-        lst=[]
-        for coordenadas in m:
-            if obtem_linha(coordenadas)==i:
-                lst+=[coordenadas]
-        meio +=("%.2d|"%(i)) + campo_para_str_aux(m,lst) + "|\n"
-    return inicio + meio + fim
+    return m["parcelas"]
 
-def coloca_minas(m,c,g,n):
-    """Esta função modifica destrutivamente o campo m escondendo n minas 
-    em parcelas dentro do campo
+def soma_mina_vizinha(m,i):
+    """Esta função soma uma mina ao número de minas vizinhas da parcela na
+    posição i do campo m, para uma mina que está fora do campo, como nos
+    blocos de um campo infinito
 
     Args:
         m (TAD campo): Campo
-        c (TAD coordenada): Coordenada
-        g (TAD gerador): Gerador
-        n (int): Número de minas
+        i (int): Posição da parcela no bytearray do campo m
     """
-    def coloca_minas_aux(m,c,g,n,nova_coordenada):
-        if n==0:
-            return m
-        elif not coordenadas_iguais(nova_coordenada,c) and nova_coordenada not \
-            in obtem_coordenadas_vizinhas(c)\
-            and not eh_parcela_minada(obtem_parcela(m,nova_coordenada)):
-                return esconde_mina(obtem_parcela(m,nova_coordenada)) and\
-                    coloca_minas_aux(m,c,g,n-1,obtem_coordenada_aleatoria(cria_coordenada\
-                (obtem_ultima_coluna(m),obtem_ultima_linha(m)),g))
-        else:
-            return coloca_minas_aux(m,c,g,n,obtem_coordenada_aleatoria(cria_coordenada\
-                (obtem_ultima_coluna(m),obtem_ultima_linha(m)),g))
-    return coloca_minas_aux(m,c,g,n,obtem_coordenada_aleatoria(cria_coordenada(\
-        obtem_ultima_coluna(m),obtem_ultima_linha(m)),g))
-
-def limpa_campo_aux(m,coordenadas_vizinhas): #Função auxiliar das coordenadas vizinhas
-    if coordenadas_vizinhas==():
-        return m
-    return limpa_campo_aux2(m,coordenadas_vizinhas[0]) and \
-        limpa_campo_aux(m,coordenadas_vizinhas[1:])
-        
-def limpa_campo_aux2(m,c): #Função auxiliar para limpar as parcelas
-    if eh_coordenada_do_campo(m,c) and eh_parcela_tapada(obtem_parcela(m,c)):
-        limpa_parcela(obtem_parcela(m,c))
-        if obtem_numero_minas_vizinhas(m,c) !=0 or eh_parcela_minada(obtem_parcela(m,c)):
-            return m
-        return limpa_campo_aux(m,obtem_coordenadas_vizinhas(c))
-    return m
-
-def limpa_campo(m,c):
-    """Esta função modifica destrutivamente o campo limpando a parcela 
-    na coordenada c e o devolvendo-a
+    parcelas=m["parcelas"]
+    parcelas[i]+=16
+    if m["diario"] is not None:
+        m["diario"].append((i,parcelas[i]-16,parcelas[i]))
 
+def obtem_indice(m,c):
+    """
     Args:
         m (TAD campo): Campo
         c (TAD coordenada): Coordenada
-    """
-    if eh_coordenada_do_campo(m,c) and eh_parcela_tapada(obtem_parcela(m,c)):
-        return limpa_campo_aux2(m,c)
-    
-    elif eh_coordenada_do_campo(m,c) and eh_parcela_marcada(obtem_parcela(m,c)):
-        limpa_parcela(obtem_parcela(m,c))
-        if obtem_numero_minas_vizinhas(m,c) !=0 or eh_parcela_minada(obtem_parcela(m,c)):
-            return m
-        return limpa_campo_aux(m,obtem_coordenadas_vizinhas(c))
-    return m
 
-def jogo_ganho(m):
-    """Esta função é uma função auxiliar
+    Returns:
+        int: Posição da parcela da coordenada c no bytearray do campo m
+    """
+    coluna=obtem_coluna(c)
+    return (obtem_linha(c)-1)*m["colunas"] \
+        + (ord(coluna)-ord("A") if len(coluna)==1 else coluna_para_numero(coluna)-1)
 
+def obtem_coordenada_indice(m,i):
+    """
     Args:
-        m (TAD campo): Campo do jogo das minas
+        m (TAD campo): Campo
+        i (int): Posição de uma parcela no bytearray do campo m
 
     Returns:
-        bool: True se todas as parcelas sem minas se encontram
-        limpas, ou False caso contrário
+        TAD coordenada: Coordenada da parcela na posição i
     """
-    jogo_limpo=True
-    coordenadas=()
-    for c in obtem_coordenadas(m,"tapadas"):
-        coordenadas+=(c,)
-    for c in obtem_coordenadas(m,"marcadas"):
-        coordenadas+=(c,)
-    for c in coordenadas:
-        if not eh_parcela_minada(obtem_parcela(m,c)):
-            jogo_limpo=False
-            return jogo_limpo
-    return jogo_limpo
+    coluna=i%m["colunas"]
+    return obtem_coordenada_interna(chr(ord("A")+coluna) if coluna<26 else numero_para_coluna(coluna+1),\
+        i//m["colunas"]+1)
 
-def turno_jogador(m):
-    """Esta função modifica destrutivamente o campo de acordo 
-    com ação escolhida
+indices_vizinhos_internos={} #indices_vizinhos_internos[(colunas,linhas)][i] são as posições vizinhas de i
+LIMITE_TABELA_VIZINHOS=1<<16 #em campos com mais parcelas as posições vizinhas são calculadas quando pedidas
+#As tabelas criadas nunca são apagadas nem recriadas. Depois de somarem este número
+#de parcelas, os campos de outras dimensões calculam as posições vizinhas quando pedidas.
+MAXIMO_PARCELAS_TABELAS=2*LIMITE_TABELA_VIZINHOS
+parcelas_tabelas=0 #parcelas de todas as tabelas em indices_vizinhos_internos
+DESLOCAMENTOS=((-1,-1),(0,-1),(1,-1),(1,0),(1,1),(0,1),(-1,1),(-1,0)) #(dx,dy) das vizinhas, por ordem
 
+def calcula_indices_vizinhos(colunas,linhas):
+    """
     Args:
-        m (TAD campo): Campo de minas
+        colunas (int): Número de colunas de um campo
+        linhas (int): Número de linhas de um campo
 
     Returns:
-        bool: False caso o jogador tenha limpo
-        uma parcela que continha uma mina, ou True caso contrário
+        tuple: Para cada posição de um campo com estas dimensões, o tuplo das
+        posições vizinhas pela mesma ordem de obtem_coordenadas_vizinhas
     """
-    acao,coordenada=""," 0"
-    numeros= ['0','1','2','3','4','5','6','7','8','9']
+    return tuple(tuple((y+dy)*colunas+x+dx for dx,dy in DESLOCAMENTOS \
+        if 0<=x+dx<colunas and 0<=y+dy<linhas) \
+            for y in range(linhas) for x in range(colunas))
+
+def calcula_indices_vizinhos_posicao(colunas,linhas,i):
+    """
+    Args:
+        colunas (int): Número de colunas de um campo
+        linhas (int): Número de linhas de um campo
+        i (int): Posição de uma parcela
+
+    Returns:
+        tuple: Posições vizinhas de i, como em calcula_indices_vizinhos
+    """
+    y,x=divmod(i,colunas)
+    return tuple((y+dy)*colunas+x+dx for dx,dy in DESLOCAMENTOS \
+        if 0<=x+dx<colunas and 0<=y+dy<linhas)
+
+def obtem_indices_vizinhos(m,i):
+    """
+    Args:
+        m (TAD campo): Campo
+        i (int): Posição de uma parcela no bytearray do campo m
+
+    Returns:
+        tuple: Posições das parcelas vizinhas dentro do campo, pela
+        mesma ordem de obtem_coordenadas_vizinhas
+    """
+    tabela=obtem_tabela_vizinhos(m)
+    if tabela is None:
+        return calcula_indices_vizinhos_posicao(m["colunas"],m["linhas"],i)
+    return tabela[i]
+
+def obtem_tabela_vizinhos(m):
+    """Esta função devolve a tabela das posições vizinhas das dimensões do
+    campo m, criando-a na primeira vez se o campo não tiver mais de
+    LIMITE_TABELA_VIZINHOS parcelas e as tabelas criadas não passarem de
+    MAXIMO_PARCELAS_TABELAS parcelas
+
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        tuple: Tabela das posições vizinhas de todas as posições do campo m,
+        ou None se não existir nem puder ser criada
+    """
+    global parcelas_tabelas
+    dimensoes=(m["colunas"],m["linhas"])
+    tabela=indices_vizinhos_internos.get(dimensoes)
+    n=m["colunas"]*m["linhas"]
+    if tabela is None and n<=LIMITE_TABELA_VIZINHOS and parcelas_tabelas+n<=MAXIMO_PARCELAS_TABELAS:
+        parcelas_tabelas+=n
+        tabela=indices_vizinhos_internos[dimensoes]=calcula_indices_vizinhos(*dimensoes)
+    return tabela
+
+def obtem_funcao_vizinhos(m):
+    """
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        function: Função que recebe uma posição do campo m e devolve as
+        posições vizinhas, lidas da tabela se ela existir ou puder ser
+        criada e calculadas caso contrário, sem criar a tabela de todo o campo
+    """
+    tabela=obtem_tabela_vizinhos(m)
+    if tabela is None:
+        colunas,linhas=m["colunas"],m["linhas"]
+        return lambda i: calcula_indices_vizinhos_posicao(colunas,linhas,i)
+    return tabela.__getitem__
+
+def obtem_parcela(m, c):
+    """
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+
+    Returns:
+        list: Parcela do campo m que se encontra na coordenada c
+    """
+    return [m,obtem_indice(m,c)]
+
+def obtem_coordenadas(m,s):
+    """Esta função devolve o tuplo formado pelas coordenadas ordenadas
+    em ordem ascendente de esquerda à direita e de cima a baixo das parcelas
+    dependendo do valor de s
+
+    Args:
+        m (TAD campo): Campo
+        s (str): Estado inicial
+
+    Returns:
+        tuple: Tuplo de coordenadas
+    """
+    if s not in BITS_ESTADOS:
+        return ()
+    if s not in m["ordenadas"]:
+        if s not in m["indices"]:
+            m["indices"][s]={i for i,parcela in enumerate(m["parcelas"]) if parcela & BITS_ESTADOS[s]}
+        m["ordenadas"][s]=tuple(obtem_coordenada_indice(m,i) \
+            for i in sorted(m["indices"][s])) #as parcelas estão guardadas linha a linha
+    return m["ordenadas"][s]
+
+def obtem_numero_parcelas(m,s):
+    """
+    Args:
+        m (TAD campo): Campo
+        s (str): Estado ("tapadas", "marcadas", "limpas" ou "minadas")
+
+    Returns:
+        int: Número de parcelas do campo m no estado s
+    """
+    if s not in BITS_ESTADOS:
+        return 0
+    return m["contagens"][s]
+
+def obtem_numero_minas_vizinhas(m,c):
+    """
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+
+    Returns:
+        int: Número de parcelas vizinhas da parcela na
+        coordenada c que escondem uma mina
+    """
+    if eh_coordenada_do_campo(m,c):
+        return m["parcelas"][obtem_indice(m,c)]>>4
+    contador=0
+    for coordenada in obtem_coordenadas_vizinhas(c):
+        if eh_coordenada_do_campo(m,coordenada) and m["parcelas"][obtem_indice(m,coordenada)] & MINADA:
+            contador+=1
+    return contador
+
+def eh_campo(arg):
+    """
+    Args:
+        arg (universal): Argumento Universal
+
+    Returns:
+        bool: True caso o seu argumento seja um TAD campo e
+        False caso contrário.
+    """
+    return type(arg)==dict and type(arg.get("colunas"))==int and type(arg.get("linhas"))==int \
+        and type(arg.get("parcelas"))==bytearray and 1<=arg["colunas"] and 1<=arg["linhas"] \
+            and len(arg["parcelas"])==arg["colunas"]*arg["linhas"] \
+                and b"\1" not in arg["parcelas"].translate(TABELA_ESTADOS_INVALIDOS) #um só estado por parcela
+
+def eh_coordenada_do_campo(m,c):
+    """
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+
+    Returns:
+        bool: True se c é uma coordenada válida dentro do campo m
+    """
+    return eh_coordenada(c) and obtem_linha(c)<=m["linhas"] and (ord(obtem_coluna(c))-ord("A")<m["colunas"] \
+        if len(obtem_coluna(c))==1 else coluna_para_numero(obtem_coluna(c))<=m["colunas"])
+
+def obtem_hash_campo(m):
+    """
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        int: Hash de 64 bits do estado e das minas das parcelas do campo m.
+        Campos iguais com as mesmas dimensões têm o mesmo hash.
+    """
+    return m["hash"]
+
+def campos_iguais(m1,m2):
+    """
+    Args:
+        m1 (TAD campo): Campo 1
+        m2 (TAD campo): Campo 2
+
+    Returns:
+        bool: True apenas se m1 e m2 forem campos e
+        forem iguais
+    """
+    if type(m1)==dict and type(m2)==dict and type(m1.get("hash"))==int \
+        and type(m2.get("hash"))==int and m1["hash"]!=m2["hash"]: #campos com hashes diferentes são diferentes
+        return False
+    return eh_campo(m1) and eh_campo(m2) and m1["colunas"]==m2["colunas"] \
+        and m1["linhas"]==m2["linhas"] and m1["parcelas"]==m2["parcelas"]
+
+def simbolo_parcela(parcela):
+    """
+    Args:
+        parcela (int): Byte de uma parcela no bytearray de um campo
+
+    Returns:
+        str: Carater que representa a parcela em campo_para_str
+    """
+    if parcela & TAPADA:
+        return "#"
+    elif parcela & MARCADA:
+        return "@"
+    elif parcela & LIMPA and parcela & MINADA:
+        return "X"
+    elif parcela & LIMPA and parcela>>4==0:
+        return " "
+    elif parcela & LIMPA and parcela>>4<=8:
+        return "%d"%(parcela>>4)
+    return "?" #byte inválido
+
+#O carater de cada parcela depende apenas do seu byte, pelo que uma linha do
+#campo é representada de uma vez com bytes.translate
+TABELA_SIMBOLOS=bytes(ord(simbolo_parcela(parcela)) for parcela in range(256))
+
+def obtem_largura_linhas(m):
+    """
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        int: Número de algarismos com que as linhas do campo são numeradas,
+        no mínimo 2
+    """
+    return max(2,len(str(m["linhas"])))
+
+def representa_linha(m,y):
+    """
+    Args:
+        m (TAD campo): Campo
+        y (int): Linha do campo, a começar em 0
+
+    Returns:
+        str: Linha y do campo tal como aparece em campo_para_str
+    """
+    inicio=y*m["colunas"]
+    return ("%.*d|"%(obtem_largura_linhas(m),y+1)) + m["parcelas"][inicio:inicio+m["colunas"]].translate(TABELA_SIMBOLOS)\
+        .decode("ascii") + "|"
+
+def atualiza_linhas_str(m):
+    """Esta função atualiza a cache das linhas representadas do campo m,
+    voltando a representar só as linhas alteradas desde a última vez
+
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        list: Linhas do campo, a começar em 0, que foram novamente representadas
+    """
+    if m["linhas_str"] is None:
+        m["linhas_str"]=[representa_linha(m,y) for y in range(m["linhas"])]
+        m["linhas_alteradas"]=set()
+        return list(range(m["linhas"]))
+    alteradas=sorted(m["linhas_alteradas"])
+    for y in alteradas:
+        m["linhas_str"][y]=representa_linha(m,y)
+    m["linhas_alteradas"]=set()
+    return alteradas
+
+def campo_para_str(m):
+    """Esta função devolve a representação do campo em cadeia de carateres
+
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        str: Cadeia de caracteres que representa o campo de minas
+    """
+    atualiza_linhas_str(m)
+    margem=" "*obtem_largura_linhas(m)
+    #colunas com mais de uma letra são escritas na vertical, uma letra por linha
+    altura=len(obtem_ultima_coluna(m))
+    nomes=[numero_para_coluna(k).rjust(altura) for k in range(1,m["colunas"]+1)]
+    inicio="".join([margem + " " + "".join([nome[k] for nome in nomes]) + "\n" for k in range(altura)])\
+        + margem + "+" + "-"*m["colunas"] + "+\n"
+    fim = margem + "+" + "-"*m["colunas"] + "+"
+    return inicio + "".join([linha + "\n" for linha in m["linhas_str"]]) + fim
+
+def campo_para_str_alteracoes(m,linha_terminal):
+    """Esta função devolve as sequências ANSI que reescrevem num terminal
+    apenas as linhas do campo alteradas desde a última representação
+
+    Args:
+        m (TAD campo): Campo
+        linha_terminal (int): Linha do terminal, a começar em 1, onde está
+        a primeira linha de campo_para_str(m)
+
+    Returns:
+        str: Cadeia de caracteres com os movimentos do cursor e as linhas alteradas
+    """
+    cabecalho=len(obtem_ultima_coluna(m))+1 #linhas com os nomes das colunas e o limite superior
+    return "".join(["\033[%d;1H%s\033[K" %(linha_terminal+cabecalho+y,m["linhas_str"][y]) \
+        for y in atualiza_linhas_str(m)])
+
+def coloca_minas_indices(m,i,g,n):
+    """Esta função modifica destrutivamente o campo m escondendo n minas,
+    fora da parcela na posição i e das suas vizinhas, consumindo o gerador
+    tal como coloca_minas: cada sorteio gera primeiro a coluna e depois a
+    linha, e é feito um último sorteio depois de esconder a última mina.
+
+    Args:
+        m (TAD campo): Campo
+        i (int): Posição da parcela da primeira jogada
+        g (TAD gerador): Gerador
+        n (int): Número de minas
+
+    Returns:
+        int: Número de sorteios rejeitados
+    """
+    if DEPURACAO and not (eh_campo(m) and eh_parcela([m,i]) and eh_gerador(g) and type(n)==int):
+        raise ValueError ("coloca_minas_indices: argumentos invalidos")
+    parcelas,colunas,linhas=m["parcelas"],m["colunas"],m["linhas"]
+    zona_segura=set(obtem_indices_vizinhos(m,i))|{i}
+    rejeitados=0
+    coluna=atualiza_estado(g)%colunas #o mesmo que gera_carater_aleatorio
+    nova=(atualiza_estado(g)%linhas)*colunas + coluna #o mesmo que gera_numero_aleatorio
+    while n>0:
+        if nova not in zona_segura and not parcelas[nova] & MINADA:
+            esconde_mina([m,nova])
+            n-=1
+        else:
+            rejeitados+=1
+        coluna=atualiza_estado(g)%colunas
+        nova=(atualiza_estado(g)%linhas)*colunas + coluna
+    return rejeitados
+
+def coloca_minas(m,c,g,n):
+    """Esta função modifica destrutivamente o campo m escondendo n minas 
+    em parcelas dentro do campo
+
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+        g (TAD gerador): Gerador
+        n (int): Número de minas
+
+    Returns:
+        TAD campo: Campo m com as minas escondidas
+    """
+    coloca_minas_indices(m,obtem_indice(m,c),g,n)
+    return m
+
+def limpa_campo_lote_indices(m,indices):
+    """Esta função limpa as parcelas tapadas ou marcadas nas posições indices
+    do campo m e, a partir das que não tiverem minas vizinhas, as parcelas
+    tapadas à sua volta, numa única limpeza em cascata iterativa. As próprias
+    parcelas limpas servem de registo das posições já visitadas.
+
+    Args:
+        m (TAD campo): Campo
+        indices (iterable): Posições de parcelas do campo m
+
+    Returns:
+        list: Posições das parcelas que foram limpas
+    """
+    if DEPURACAO:
+        indices=tuple(indices) #a verificação não pode gastar um iterador
+        if not (eh_campo(m) and all(eh_parcela([m,i]) for i in indices)):
+            raise ValueError ("limpa_campo_lote_indices: argumentos invalidos")
+    parcelas,vizinhos=m["parcelas"],obtem_funcao_vizinhos(m)
+    limpas=[]
+    for i in indices:
+        if parcelas[i] & (TAPADA|MARCADA):
+            altera_estado(m,i,LIMPA)
+            limpas.append(i)
+    por_visitar=limpas[:]
+    while por_visitar:
+        j=por_visitar.pop()
+        if parcelas[j]>>4==0 and not parcelas[j] & MINADA:
+            for v in vizinhos(j):
+                if parcelas[v] & TAPADA:
+                    altera_estado(m,v,LIMPA)
+                    limpas.append(v)
+                    por_visitar.append(v)
+    return limpas
+
+def limpa_campo_indices(m,i):
+    """Esta função limpa a parcela na posição i do campo m e, se esta não
+    tiver minas vizinhas, as parcelas tapadas à sua volta, de forma iterativa
+
+    Args:
+        m (TAD campo): Campo
+        i (int): Posição de uma parcela tapada ou marcada do campo m
+
+    Returns:
+        list: Posições das parcelas que foram limpas
+    """
+    return limpa_campo_lote_indices(m,(i,))
+
+def limpa_campo_lote(m,coordenadas):
+    """Esta função modifica destrutivamente o campo limpando as parcelas
+    tapadas ou marcadas nas coordenadas, com uma só limpeza em cascata
+
+    Args:
+        m (TAD campo): Campo
+        coordenadas (iterable): Coordenadas do campo
+
+    Raises:
+        ValueError: Levanta erro se alguma não for uma coordenada do campo
+
+    Returns:
+        tuple: Lista das coordenadas das parcelas que foram limpas e True se
+        alguma delas tinha uma mina
+    """
+    coordenadas=tuple(coordenadas)
+    if not all(eh_coordenada_do_campo(m,c) for c in coordenadas):
+        raise ValueError ("limpa_campo_lote: argumentos invalidos")
+    limpas=limpa_campo_lote_indices(m,[obtem_indice(m,c) for c in coordenadas])
+    #a limpeza em cascata não chega a minas, pelo que só as próprias coordenadas as podem ter
+    return [obtem_coordenada_indice(m,i) for i in limpas],any(m["parcelas"][i] & MINADA for i in limpas)
+
+def acorde(m,c):
+    """Esta função modifica destrutivamente o campo limpando, de uma só vez,
+    as parcelas tapadas vizinhas da parcela limpa em c, se o número de
+    bandeiras à volta de c for igual ao número de minas vizinhas de c
+
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+
+    Raises:
+        ValueError: Levanta erro se c não for uma coordenada do campo
+
+    Returns:
+        tuple: Lista das coordenadas das parcelas que foram limpas e True se
+        alguma delas tinha uma mina
+    """
+    if not eh_coordenada_do_campo(m,c):
+        raise ValueError ("acorde: argumentos invalidos")
+    parcelas,i=m["parcelas"],obtem_indice(m,c)
+    vizinhas=obtem_indices_vizinhos(m,i)
+    if not parcelas[i] & LIMPA or parcelas[i] & MINADA or parcelas[i]>>4==0 \
+        or sum(1 for v in vizinhas if parcelas[v] & MARCADA)!=parcelas[i]>>4:
+        return [],False
+    limpas=limpa_campo_lote_indices(m,[v for v in vizinhas if parcelas[v] & TAPADA])
+    return [obtem_coordenada_indice(m,v) for v in limpas],any(parcelas[v] & MINADA for v in limpas)
+
+def limpa_campo_coordenadas(m,c):
+    """Esta função modifica destrutivamente o campo limpando a parcela
+    na coordenada c tal como limpa_campo
+
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+
+    Returns:
+        list: Coordenadas das parcelas que foram limpas
+    """
+    if eh_coordenada_do_campo(m,c) and m["parcelas"][obtem_indice(m,c)] & (TAPADA|MARCADA):
+        return [obtem_coordenada_indice(m,i) for i in limpa_campo_indices(m,obtem_indice(m,c))]
+    return []
+
+def limpa_campo(m,c):
+    """Esta função modifica destrutivamente o campo limpando a parcela 
+    na coordenada c e o devolvendo-a
+
+    Args:
+        m (TAD campo): Campo
+        c (TAD coordenada): Coordenada
+    """
+    if eh_coordenada_do_campo(m,c) and m["parcelas"][obtem_indice(m,c)] & (TAPADA|MARCADA):
+        limpa_campo_indices(m,obtem_indice(m,c))
+    return m
+
+def jogo_ganho(m):
+    """Esta função é uma função auxiliar
+
+    Args:
+        m (TAD campo): Campo do jogo das minas
+
+    Returns:
+        bool: True se todas as parcelas sem minas se encontram
+        limpas, ou False caso contrário
+    """
+    return m["contagens"]["por_limpar"]==0
+
+def pede_acao():
+    """Esta função pede ao jogador uma ação até esta ser válida
+
+    Returns:
+        str: "L" para limpar ou "M" para marcar
+    """
+    acao=""
     while acao!="L" and acao!="M":
         acao=input("Escolha uma ação, [L]impar ou [M]arcar:")
-    while len(coordenada)!=3 or not all([n in numeros for n in coordenada[1:]]) or\
-        not (65<=ord(coordenada[0])<=ord(obtem_ultima_coluna(m)) \
-            and 1<=int(coordenada[1:])<=obtem_ultima_linha(m)):
+    return acao
+
+def eh_str_coordenada_do_campo(m,s):
+    """
+    Args:
+        m (TAD campo): Campo de minas
+        s (str): Cadeia de carateres
+
+    Returns:
+        bool: True se s é uma coordenada do campo m escrita como em
+        coordenada_para_str, por exemplo A01 ou AB123
+    """
+    numeros= ['0','1','2','3','4','5','6','7','8','9']
+    k=len(s)-len(s.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    return 0<k<len(s) and all([n in numeros for n in s[k:]]) \
+        and eh_coordenada_do_campo(m,str_para_coordenada(s)) \
+            and coordenada_para_str(str_para_coordenada(s))==s
+
+def pede_coordenada(m):
+    """Esta função pede ao jogador uma coordenada até esta ser válida
+    dentro do campo m
+
+    Args:
+        m (TAD campo): Campo de minas
+
+    Returns:
+        TAD coordenada: Coordenada escolhida
+    """
+    coordenada=" 0"
+    while not eh_str_coordenada_do_campo(m,coordenada):
         coordenada=input("Escolha uma coordenada:")
-    if acao=="L":
-        limpa_campo(m,str_para_coordenada(coordenada))
-        return not eh_parcela_minada(obtem_parcela(m,str_para_coordenada(coordenada)))
+    return str_para_coordenada(coordenada)
+
+def executa_acao(m,acao,c):
+    """Esta função modifica destrutivamente o campo de acordo
+    com a ação na coordenada c
+
+    Args:
+        m (TAD campo): Campo de minas
+        acao (str): "L" para limpar, "M" para marcar ou "A" para limpar as
+        vizinhas com acorde
+        c (TAD coordenada): Coordenada do campo
+
+    Returns:
+        bool: False caso a ação tenha limpo uma parcela que continha
+        uma mina, ou True caso contrário
+    """
+    if DEPURACAO and not (eh_campo(m) and eh_coordenada_do_campo(m,c) and acao in ("L","M","A")):
+        raise ValueError ("executa_acao: argumentos invalidos")
+    if acao=="A":
+        resultado=not acorde(m,c)[1]
     else:
-        if not eh_parcela_limpa(obtem_parcela(m,str_para_coordenada(coordenada))):
-            return alterna_bandeira(obtem_parcela(m,str_para_coordenada(coordenada)))
-        return not alterna_bandeira(obtem_parcela(m,str_para_coordenada(coordenada)))
+        i=obtem_indice(m,c) #a coordenada já foi validada por quem pede a jogada
+        if acao=="L":
+            if m["parcelas"][i] & (TAPADA|MARCADA):
+                limpa_campo_indices(m,i)
+            resultado=not m["parcelas"][i] & MINADA
+        elif not m["parcelas"][i] & LIMPA:
+            resultado=alterna_bandeira_indice(m,i)
+        else:
+            resultado=not alterna_bandeira_indice(m,i)
+    emite_alteracoes(m)
+    return resultado
+
+def turno_jogador(m):
+    """Esta função modifica destrutivamente o campo de acordo 
+    com ação escolhida
+
+    Args:
+        m (TAD campo): Campo de minas
+
+    Returns:
+        bool: False caso o jogador tenha limpo
+        uma parcela que continha uma mina, ou True caso contrário
+    """
+    acao=pede_acao()
+    return executa_acao(m,acao,pede_coordenada(m))
+
+def verifica_erros(c,l,n,d,s,funcao="minas"):
+    if not (eh_nome_coluna(c) and type(l)==int and type(n)==int and type(d)==int \
+        and type(s)==int and 1<=l and coluna_para_numero(c)*l-9>n>0 and(d==32 or d==64) \
+            and 0<s<=(2**d)-1): #coluna_para_numero(c)*l-9 ---> Número de parcelas-9
+        raise ValueError ("%s: argumentos invalidos" %(funcao))
+
+#TAD sessao-Representação interna: {"campo":TAD campo,"gerador":TAD gerador,"minas":int,
+#"iniciada":bool,"perdida":bool,"jogadas":int,"desfazer":list,"refazer":list}
+#Permite jogar ao jogo das minas sem input() nem print(). Antes de cada jogada
+#é guardada em "desfazer" a marca do campo e o resto do estado da sessão.
+def cria_sessao(c,l,n,d,s):
+    """Esta função cria uma sessão do jogo das minas, antes da primeira jogada
+
+    Args:
+        c (str): Última coluna
+        l (int): Última linha
+        n (int): Número de parcelas com minas
+        d (int): Dimensão do gerador de números
+        s (int): Estado inicial ou seed
+
+    Raises:
+        ValueError: Levanta erro caso os seus argumentos não sejam válidos
+
+    Returns:
+        TAD sessao: Sessão
+    """
+    verifica_erros(c,l,n,d,s,"cria_sessao")
+    return restaura_sessao(cria_campo(c,l),cria_gerador(d,s),n,False,False,0)
+
+def restaura_sessao(m,g,n,iniciada,perdida,jogadas):
+    """Esta função volta a criar uma sessão a partir das suas partes, por
+    exemplo depois de a ler de um ficheiro
+
+    Args:
+        m (TAD campo): Campo
+        g (TAD gerador): Gerador
+        n (int): Número de parcelas com minas
+        iniciada (bool): Se a primeira jogada já foi feita
+        perdida (bool): Se foi limpa uma parcela minada
+        jogadas (int): Número de jogadas feitas
+
+    Returns:
+        TAD sessao: Sessão
+    """
+    obtem_marca_campo(m)
+    return {"campo":m,"gerador":g,"minas":n,"iniciada":iniciada,"perdida":perdida,\
+        "jogadas":jogadas,"desfazer":[],"refazer":[]}
+
+def obtem_campo_sessao(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        TAD campo: Campo da sessão j
+    """
+    return j["campo"]
+
+def obtem_gerador_sessao(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        TAD gerador: Gerador da sessão j
+    """
+    return j["gerador"]
+
+def sessao_iniciada(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        bool: True se a primeira jogada da sessão j já foi feita
+    """
+    return j["iniciada"]
+
+def sessao_perdida(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        bool: True se foi limpa uma parcela minada na sessão j
+    """
+    return j["perdida"]
+
+def obtem_minas_sessao(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        int: Número de minas do campo da sessão j
+    """
+    return j["minas"]
+
+def obtem_jogadas_sessao(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        int: Número de jogadas feitas na sessão j, incluindo a primeira
+    """
+    return j["jogadas"]
+
+def obtem_estado_sessao(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        str: "inicio" antes da primeira jogada, "derrota" se foi limpa uma
+        parcela minada, "vitoria" se todas as parcelas sem minas estão limpas
+        e "em_curso" caso contrário
+    """
+    if not j["iniciada"]:
+        return "inicio"
+    elif j["perdida"]:
+        return "derrota"
+    elif jogo_ganho(j["campo"]):
+        return "vitoria"
+    return "em_curso"
+
+def eh_sessao(arg):
+    """
+    Args:
+        arg (universal): Argumento universal
+
+    Returns:
+        bool: True caso o seu argumento seja um TAD sessao e
+        False caso contrário
+    """
+    return type(arg)==dict and eh_campo(arg.get("campo")) and eh_gerador(arg.get("gerador")) \
+        and type(arg.get("minas"))==int and type(arg.get("iniciada"))==bool \
+            and type(arg.get("perdida"))==bool and type(arg.get("jogadas"))==int \
+                and type(arg.get("desfazer"))==list and type(arg.get("refazer"))==list
+
+def primeira_jogada(j,c,coloca=coloca_minas):
+    """Esta função esconde as minas do campo da sessão j fora da coordenada
+    c e das suas vizinhas e limpa a parcela em c
+
+    Args:
+        j (TAD sessao): Sessão
+        c (TAD coordenada): Coordenada
+        coloca (function): Função que esconde as minas, com os argumentos
+        de coloca_minas
+
+    Raises:
+        ValueError: Levanta erro se a sessão já foi iniciada ou se c não
+        for uma coordenada do campo. Se coloca levantar um erro, a sessão
+        fica como antes da jogada.
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    if j["iniciada"] or not eh_coordenada_do_campo(j["campo"],c):
+        raise ValueError ("primeira_jogada: argumentos invalidos")
+    jogada=(obtem_marca_campo(j["campo"]),obtem_resto_sessao(j))
+    try:
+        coloca(j["campo"],c,j["gerador"],j["minas"])
+    except Exception: #a sessão volta ao estado anterior e não guarda a jogada
+        desfaz_campo(j["campo"],jogada[0])
+        define_resto_sessao(j,jogada[1])
+        raise
+    guarda_jogada(j,jogada)
+    limpa_campo(j["campo"],c)
+    emite_alteracoes(j["campo"])
+    j["iniciada"]=True
+    j["jogadas"]+=1
+    return obtem_estado_sessao(j)
+
+def obtem_resto_sessao(j): #Função auxiliar de guarda_jogada, desfazer e refazer
+    return j["iniciada"],j["perdida"],j["jogadas"],obtem_estado(j["gerador"])
+
+def define_resto_sessao(j,resto): #Função auxiliar de desfazer e refazer
+    j["iniciada"],j["perdida"],j["jogadas"]=resto[:3]
+    define_estado(j["gerador"],resto[3])
+
+def guarda_jogada(j,jogada=None): #Função auxiliar de primeira_jogada, joga_sessao e limpar_lote
+    if jogada is None:
+        jogada=(obtem_marca_campo(j["campo"]),obtem_resto_sessao(j))
+    j["desfazer"].append(jogada)
+    j["refazer"].clear()
+
+def joga_sessao(j,acao,c,funcao): #Função auxiliar de limpar e marcar
+    if not j["iniciada"] or j["perdida"] or not eh_coordenada_do_campo(j["campo"],c):
+        raise ValueError ("%s: argumentos invalidos" %(funcao))
+    guarda_jogada(j)
+    j["jogadas"]+=1
+    j["perdida"]=not executa_acao(j["campo"],acao,c)
+    return obtem_estado_sessao(j)
+
+def limpar(j,c):
+    """Esta função limpa a parcela na coordenada c do campo da sessão j,
+    tal como turno_jogador com a ação [L]impar
+
+    Args:
+        j (TAD sessao): Sessão
+        c (TAD coordenada): Coordenada
+
+    Raises:
+        ValueError: Levanta erro se a sessão não foi iniciada, se já
+        foi perdida ou se c não for uma coordenada do campo
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    return joga_sessao(j,"L",c,"limpar")
+
+def marcar(j,c):
+    """Esta função alterna a bandeira da parcela na coordenada c do campo
+    da sessão j, tal como turno_jogador com a ação [M]arcar
+
+    Args:
+        j (TAD sessao): Sessão
+        c (TAD coordenada): Coordenada
+
+    Raises:
+        ValueError: Levanta erro se a sessão não foi iniciada, se já
+        foi perdida ou se c não for uma coordenada do campo
 
-def verifica_erros(c,l,n,d,s):
-    if not (type(c)==str and type(l)==int and type(n)==int and type(d)==int \
-        and type(s)==int and len(c)==1 and (ord(c)-65+1)*l-9>n>0 and(d==32 or d==64) \
-            and 0<s<=(2**d)-1 and 1<=l<=99 and 65<=ord(c)<=90): #(ord(c)-65+1)*l-9 ---> Número de parcelas-9
-        raise ValueError ("minas: argumentos invalidos")
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    return joga_sessao(j,"M",c,"marcar")
 
-def minas(c,l,n,d,s):
+def limpar_acorde(j,c):
+    """Esta função limpa de uma só vez as parcelas tapadas vizinhas da
+    parcela limpa na coordenada c do campo da sessão j, se as bandeiras à
+    sua volta já igualarem o seu número, tal como acorde
+
+    Args:
+        j (TAD sessao): Sessão
+        c (TAD coordenada): Coordenada
+
+    Raises:
+        ValueError: Levanta erro se a sessão não foi iniciada, se já
+        foi perdida ou se c não for uma coordenada do campo
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    return joga_sessao(j,"A",c,"limpar_acorde")
+
+def limpar_lote(j,coordenadas):
+    """Esta função limpa, numa só jogada e com uma só limpeza em cascata,
+    as parcelas nas coordenadas do campo da sessão j
+
+    Args:
+        j (TAD sessao): Sessão
+        coordenadas (iterable): Coordenadas
+
+    Raises:
+        ValueError: Levanta erro se a sessão não foi iniciada, se já foi
+        perdida ou se alguma não for uma coordenada do campo
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    coordenadas=tuple(coordenadas)
+    if not j["iniciada"] or j["perdida"] or not all(eh_coordenada_do_campo(j["campo"],c) for c in coordenadas):
+        raise ValueError ("limpar_lote: argumentos invalidos")
+    guarda_jogada(j)
+    j["jogadas"]+=1
+    j["perdida"]=limpa_campo_lote(j["campo"],coordenadas)[1]
+    emite_alteracoes(j["campo"])
+    return obtem_estado_sessao(j)
+
+def esquece_historico(j):
+    """Esta função esquece as jogadas que podiam ser desfeitas ou refeitas
+    na sessão j e o diário do seu campo, para limitar a memória usada por
+    sessões longas
+
+    Args:
+        j (TAD sessao): Sessão
+    """
+    j["desfazer"].clear()
+    j["refazer"].clear()
+    j["campo"]["diario"]=[]
+
+def desfazer(j):
+    """Esta função desfaz a última jogada da sessão j, incluindo a
+    primeira jogada
+
+    Args:
+        j (TAD sessao): Sessão
+
+    Raises:
+        ValueError: Levanta erro se não houver jogadas a desfazer
+
+    Returns:
+        str: Estado da sessão depois de desfazer a jogada
+    """
+    if not j["desfazer"]:
+        raise ValueError ("desfazer: argumentos invalidos")
+    marca,resto=j["desfazer"].pop()
+    j["refazer"].append((desfaz_campo(j["campo"],marca),obtem_resto_sessao(j)))
+    emite_alteracoes(j["campo"])
+    define_resto_sessao(j,resto)
+    return obtem_estado_sessao(j)
+
+def refazer(j):
+    """Esta função volta a fazer a última jogada desfeita da sessão j.
+    Depois de uma nova jogada, as jogadas desfeitas não podem ser refeitas.
+
+    Args:
+        j (TAD sessao): Sessão
+
+    Raises:
+        ValueError: Levanta erro se não houver jogadas a refazer
+
+    Returns:
+        str: Estado da sessão depois de refazer a jogada
+    """
+    if not j["refazer"]:
+        raise ValueError ("refazer: argumentos invalidos")
+    alteracoes,resto=j["refazer"].pop()
+    j["desfazer"].append((obtem_marca_campo(j["campo"]),obtem_resto_sessao(j)))
+    refaz_campo(j["campo"],alteracoes)
+    emite_alteracoes(j["campo"])
+    define_resto_sessao(j,resto)
+    return obtem_estado_sessao(j)
+
+def minas(c,l,n,d,s,incremental=False):
     """Esta função é a função principal que permite jogar ao jogo das minas.
 
     Args:
@@ -761,6 +2005,8 @@ def minas(c,l,n,d,s):
         n (int): Número de parcelas com minas
         d (int): Dimensão do gerador de números
         s (int): Estado inicial ou seed
+        incremental (bool): Se True, o campo é desenhado no topo do terminal e
+        depois de cada jogada só são reescritas as linhas alteradas
 
     Raises:
         ValueError: Levanta erro caso os seus argumentos não sejam válidos
@@ -770,21 +2016,26 @@ def minas(c,l,n,d,s):
     """
     verifica_erros(c,l,n,d,s)
     def minas_aux():
-        print("   [Bandeiras %d/%d]" %(len(obtem_coordenadas(m,"marcadas")),n))
+        if incremental and m["linhas_str"] is not None:
+            print("\033[1;1H   [Bandeiras %d/%d]\033[K" %(obtem_numero_parcelas(m,"marcadas"),n)\
+                + campo_para_str_alteracoes(m,2) + "\033[%d;1H\033[J" %(l+4+len(c)),end="")
+            return
+        if incremental:
+            print("\033[2J\033[H",end="")
+        print("   [Bandeiras %d/%d]" %(obtem_numero_parcelas(m,"marcadas"),n))
         print(campo_para_str(m))
-    m=cria_campo(c,l)
-    g=cria_gerador(d,s)
-    coordenadas=" 0"
-    numeros= ['0','1','2','3','4','5','6','7','8','9']
+    j=cria_sessao(c,l,n,d,s)
+    m=obtem_campo_sessao(j)
     minas_aux() #Inicio do jogo
-    while len(coordenadas)!=3 or not all([n in numeros for n in coordenadas[1:]]) or \
-        not (65<=ord(coordenadas[0])<=ord(obtem_ultima_coluna(m)) \
-            and 1<=int(coordenadas[1:])<=obtem_ultima_linha(m)):
-        coordenadas=input("Escolha uma coordenada:") #Primeira jogada
-    coordenadas=str_para_coordenada(coordenadas)
-    print("   [Bandeiras %d/%d]" %(len(obtem_coordenadas(m,"marcadas")),n))
-    print(campo_para_str(limpa_campo(coloca_minas(m,coordenadas,g,n),coordenadas)))
-    while turno_jogador(m): #Ciclo de jogadas
+    primeira_jogada(j,pede_coordenada(m))
+    minas_aux()
+    while True: #Ciclo de jogadas
+        if pede_acao()=="L":
+            estado=limpar(j,pede_coordenada(m))
+        else:
+            estado=marcar(j,pede_coordenada(m))
+        if estado=="derrota":
+            break
         minas_aux()
         if jogo_ganho(m):
             print("VITORIA!!!")
@@ -0,0 +1,192 @@
+#Medição do desempenho das operações principais do campo, em vários tamanhos,
+#e comparação com os valores de referência guardados em desempenho_base.json
+#
+#python desempenho.py              compara com a referência e falha se houver regressões
+#python desempenho.py grava        grava os valores medidos como nova referência
+#
+#Cada repetição de uma medição é seguida, durante o mesmo tempo, de ciclos de
+#calibração de trabalho fixo, e os tempos são comparados em unidades da duração
+#média desses ciclos, para que a referência gravada numa máquina sirva noutra
+#mais lenta ou mais rápida e uma máquina ocupada durante parte da execução não
+#pareça uma regressão. A referência deve ainda assim voltar a ser gravada depois
+#de cada alteração que mude o desempenho de propósito.
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from Projeto_2 import cria_campo, cria_copia_campo, cria_gerador, cria_coordenada, coloca_minas, \
+    limpa_campo, campo_para_str, obtem_coordenadas, jogo_ganho, obtem_coordenada_indice, MINADA, \
+    coluna_para_numero, numero_para_coluna, obtem_bytes_campo
+from simulacao import joga_jogo
+from solucionador import politica_solucionador
+
+TAMANHOS=(("A",1),("I",9),("P",16),("Z",50),("Z",99))
+SEED=20231
+REPETICOES=5 #número mínimo de medições
+DURACAO=0.1 #as medições repetem-se até somarem este tempo, com no máximo 200
+TOLERANCIA=1.5 #razão máxima entre o valor medido e a referência
+MINIMO_SEGUNDOS=0.0005 #diferenças abaixo deste tempo são ruído
+REFERENCIA=os.path.join(os.path.dirname(os.path.abspath(__file__)),"desempenho_base.json")
+
+def ciclo_calibracao():
+    """Trabalho fixo com as operações que dominam o jogo: índices de um
+    bytearray, operações de bits, listas e dicionários
+
+    Returns:
+        int: Resultado do ciclo
+    """
+    parcelas,vistos,por_visitar=bytearray(range(256))*16,{},[]
+    for i in range(len(parcelas)):
+        if parcelas[i] & 2 and i not in vistos:
+            vistos[i]=parcelas[i]>>4
+            por_visitar.append(i)
+    return len(por_visitar)+sum(vistos.values())
+
+def cronometra(funcao,argumento): #Função auxiliar de mede
+    inicio=time.perf_counter()
+    funcao(argumento)
+    return time.perf_counter()-inicio
+
+def mede(prepara,funcao,repeticoes=REPETICOES):
+    """
+    Args:
+        prepara (function): Função sem argumentos cujo resultado é passado a
+        funcao, executada fora da medição
+        funcao (function): Função a medir
+        repeticoes (int): Número mínimo de medições
+
+    Returns:
+        dict: Menor tempo em segundos, o mesmo tempo em unidades da menor
+        duração média do ciclo de calibração medida a seguir a uma repetição
+        e pico de memória alocada em bytes
+    """
+    segundos=ciclo=None
+    total,feitas=0.0,0
+    while feitas<repeticoes or (total<DURACAO and feitas<200):
+        duracao=cronometra(funcao,prepara())
+        ciclos,calibracao=0,0.0
+        while ciclos==0 or calibracao<duracao:
+            calibracao+=cronometra(lambda _: ciclo_calibracao(),None)
+            ciclos+=1
+        segundos=duracao if segundos is None else min(segundos,duracao)
+        ciclo=calibracao/ciclos if ciclo is None else min(ciclo,calibracao/ciclos)
+        total+=duracao
+        feitas+=1
+    argumento=prepara()
+    tracemalloc.start()
+    funcao(argumento)
+    memoria=tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"segundos":segundos,"unidades":segundos/ciclo,"memoria":memoria}
+
+def campo_com_minas(c,l,n,coordenada):
+    """
+    Args:
+        c (str): Última coluna
+        l (int): Última linha
+        n (int): Número de minas
+        coordenada (TAD coordenada): Coordenada da primeira jogada
+
+    Returns:
+        TAD campo: Campo com as n minas escondidas com a seed fixa
+    """
+    return coloca_minas(cria_campo(c,l),coordenada,cria_gerador(32,SEED),n)
+
+def limpa_todas(m):
+    """Esta função limpa uma a uma todas as parcelas sem mina do campo m
+
+    Args:
+        m (TAD campo): Campo
+    """
+    for i,parcela in enumerate(obtem_bytes_campo(m)):
+        if not parcela & MINADA:
+            limpa_campo(m,obtem_coordenada_indice(m,i))
+
+def mede_tamanho(c,l):
+    """
+    Args:
+        c (str): Última coluna
+        l (int): Última linha
+
+    Returns:
+        dict: Medições de cada operação para um campo com este tamanho
+    """
+    parcelas=coluna_para_numero(c)*l
+    centro=cria_coordenada(numero_para_coluna((1+coluna_para_numero(c))//2),(1+l)//2)
+    canto=cria_coordenada("A",1)
+    res={"cria_campo":mede(lambda: None,lambda _: cria_campo(c,l))}
+    vazio=cria_campo(c,l)
+    res["limpa_campo_cascata"]=mede(lambda: cria_copia_campo(vazio),lambda m: limpa_campo(m,canto))
+    if parcelas-9>1: #é preciso espaço para as minas fora da primeira jogada
+        esparsas,densas=max(1,parcelas//10),parcelas-10
+        res["coloca_minas_esparsas"]=mede(lambda: (cria_campo(c,l),cria_gerador(32,SEED)),\
+            lambda a: coloca_minas(a[0],centro,a[1],esparsas))
+        res["coloca_minas_densas"]=mede(lambda: (cria_campo(c,l),cria_gerador(32,SEED)),\
+            lambda a: coloca_minas(a[0],centro,a[1],densas))
+        minado=campo_com_minas(c,l,max(1,parcelas//5),centro)
+        res["limpa_campo_cliques"]=mede(lambda: cria_copia_campo(minado),limpa_todas)
+        jogado=limpa_campo(cria_copia_campo(minado),centro)
+        res["campo_para_str"]=mede(lambda: cria_copia_campo(jogado),campo_para_str)
+        res["obtem_coordenadas"]=mede(lambda: cria_copia_campo(jogado),\
+            lambda m: obtem_coordenadas(m,"tapadas"))
+        res["jogo_ganho_x1000"]=mede(lambda: jogado,lambda m: [jogo_ganho(m) for _ in range(1000)])
+        jogos=5 if parcelas<=1000 else 1
+        res["jogos_x%d" %(jogos)]=mede(lambda: None,lambda _: [joga_jogo(c,l,max(1,parcelas//8),32,s,\
+            politica_solucionador) for s in range(SEED,SEED+jogos)],repeticoes=3)
+    return res
+
+def mede_tudo():
+    """
+    Returns:
+        dict: Medições de todas as operações, indexadas por "operacao/tamanho"
+    """
+    res={}
+    for c,l in TAMANHOS:
+        for operacao,medicao in mede_tamanho(c,l).items():
+            res["%s/%s%d" %(operacao,c,l)]=medicao
+    return res
+
+def compara(medido,referencia,tolerancia=TOLERANCIA):
+    """
+    Args:
+        medido (dict): Medições de mede_tudo
+        referencia (dict): Medições de referência
+        tolerancia (float): Razão máxima entre o valor medido e a referência
+
+    Returns:
+        list: Descrição de cada regressão de tempo ou de memória
+    """
+    regressoes=[]
+    for chave,valores in sorted(medido.items()):
+        if chave not in referencia or "unidades" not in referencia[chave]:
+            continue
+        base=referencia[chave]
+        razao=valores["unidades"]/base["unidades"]
+        esperado=valores["segundos"]/razao #tempo da referência nesta máquina
+        if razao>tolerancia and valores["segundos"]-esperado>MINIMO_SEGUNDOS:
+            regressoes.append("%s: %.6fs (referência %.6fs nesta máquina)" %(chave,valores["segundos"],esperado))
+        if valores["memoria"]>base["memoria"]*tolerancia and valores["memoria"]-base["memoria"]>1024:
+            regressoes.append("%s: %d bytes (referência %d bytes)" %(chave,valores["memoria"],base["memoria"]))
+    return regressoes
+
+if __name__=="__main__":
+    medido=mede_tudo()
+    referencia={}
+    if os.path.exists(REFERENCIA):
+        with open(REFERENCIA) as ficheiro:
+            referencia=json.load(ficheiro)
+    for chave,valores in sorted(medido.items()):
+        base=referencia.get(chave)
+        print("%-34s %10.6fs %10d bytes%s" %(chave,valores["segundos"],valores["memoria"],\
+            "  (x%.2f)" %(valores["unidades"]/base["unidades"]) if base and base.get("unidades") else ""))
+    if len(sys.argv)>1 and sys.argv[1]=="grava":
+        with open(REFERENCIA,"w") as ficheiro:
+            json.dump(medido,ficheiro,indent=1,sort_keys=True)
+        print("Referência gravada em %s" %(REFERENCIA))
+    else:
+        regressoes=compara(medido,referencia)
+        for regressao in regressoes:
+            print("REGRESSÃO %s" %(regressao))
+        sys.exit(1 if regressoes else 0)
\ No newline at end of file
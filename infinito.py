@@ -0,0 +1,224 @@
+#Campo infinito do jogo das minas, dividido em blocos quadrados gerados só quando
+#uma limpeza ou uma representação lhes chega pela primeira vez
+#
+#TAD campo_infinito-Representação interna: {"lado":int,"minas":int,"bits":int,
+#"seed":int,"blocos":dict,"maximo_blocos":int}
+#As coordenadas são pares de inteiros (x,y), sem limites, e o bloco (bx,by)
+#contém as parcelas com x//lado==bx e y//lado==by. Cada bloco é um TAD campo de
+#lado x lado cujas minas dependem apenas da seed e de (bx,by), através do
+#gerador xorshift. Um bloco sem parcelas alteradas pode ser libertado e voltar
+#a ser gerado igual quando for preciso.
+from Projeto_2 import MINADA, TAPADA, MARCADA, LIMPA, TABELA_SIMBOLOS, cria_gerador, \
+    gera_numero_aleatorio, inicializa_campo, esconde_mina, altera_estado, alterna_bandeira_indice, \
+    obtem_numero_parcelas, mistura_splitmix, DESLOCAMENTOS, obtem_bytes_campo, soma_mina_vizinha
+
+LADO=32
+MAXIMO_BLOCOS=4096 #blocos guardados acima dos quais os blocos não alterados são libertados
+
+def cria_campo_infinito(n,d,s,lado=LADO,maximo_blocos=MAXIMO_BLOCOS):
+    """Esta função cria um campo infinito. As parcelas à volta de (0,0),
+    onde começa o jogo, nunca têm minas.
+
+    Args:
+        n (int): Número de minas em cada bloco
+        d (int): Dimensão do gerador de números
+        s (int): Seed
+        lado (int): Número de parcelas de cada lado de um bloco
+        maximo_blocos (int): Número de blocos guardados a partir do qual os
+        blocos não alterados são libertados depois de cada jogada
+
+    Raises:
+        ValueError: Levanta erro caso os argumentos não sejam válidos. Com
+        menos de uma mina por cada 8 parcelas, as zonas sem minas vizinhas
+        podiam ligar-se sem fim e uma limpeza em cascata nunca terminar.
+
+    Returns:
+        TAD campo_infinito: Campo infinito sem parcelas alteradas
+    """
+    if not (type(n)==int and type(d)==int and type(s)==int and type(lado)==int \
+        and (d==32 or d==64) and 0<s<=(2**d)-1 and lado>=3 and lado*lado//8<=n<=lado*lado-9):
+        raise ValueError ("cria_campo_infinito: argumentos invalidos")
+    return {"lado":lado,"minas":n,"bits":d,"seed":s,"blocos":{},"maximo_blocos":maximo_blocos}
+
+def semente_bloco(mi,bx,by):
+    """
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        bx (int): Coluna do bloco
+        by (int): Linha do bloco
+
+    Returns:
+        int: Estado inicial do gerador do bloco, obtido misturando a seed
+        com a posição do bloco pela função de mistura do splitmix64
+    """
+    x=mistura_splitmix((mi["seed"]*0x9e3779b97f4a7c15 ^ (bx & 0xffffffff)<<32 ^ (by & 0xffffffff)) \
+        & 0xffffffffffffffff) & ((1<<mi["bits"])-1)
+    return x or 1
+
+def calcula_minas_bloco(mi,bx,by):
+    """
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        bx (int): Coluna do bloco
+        by (int): Linha do bloco
+
+    Returns:
+        set: Posições das minas do bloco (bx,by), linha a linha
+    """
+    lado=mi["lado"]
+    g=cria_gerador(mi["bits"],semente_bloco(mi,bx,by))
+    minas=set()
+    while len(minas)<mi["minas"]:
+        i=gera_numero_aleatorio(g,lado*lado)-1
+        x,y=bx*lado+i%lado,by*lado+i//lado
+        if not (-1<=x<=1 and -1<=y<=1): #zona da primeira jogada
+            minas.add(i)
+    return minas
+
+def obtem_bloco(mi,bx,by):
+    """Esta função devolve o bloco (bx,by), gerando-o se ainda não existir.
+    Os números das parcelas na fronteira contam também as minas dos blocos
+    vizinhos, que são calculadas sem gerar esses blocos.
+
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        bx (int): Coluna do bloco
+        by (int): Linha do bloco
+
+    Returns:
+        TAD campo: Bloco
+    """
+    if (bx,by) in mi["blocos"]:
+        return mi["blocos"][(bx,by)]
+    lado=mi["lado"]
+    m=inicializa_campo(lado,lado)
+    for i in calcula_minas_bloco(mi,bx,by):
+        esconde_mina([m,i])
+    for dbx,dby in DESLOCAMENTOS:
+        for i in calcula_minas_bloco(mi,bx+dbx,by+dby):
+            x,y=dbx*lado+i%lado,dby*lado+i//lado #posição da mina relativa ao bloco
+            for dx,dy in DESLOCAMENTOS:
+                if 0<=x+dx<lado and 0<=y+dy<lado:
+                    soma_mina_vizinha(m,(y+dy)*lado+x+dx)
+    mi["blocos"][(bx,by)]=m
+    return m
+
+def obtem_numero_blocos(mi):
+    """
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+
+    Returns:
+        int: Número de blocos guardados
+    """
+    return len(mi["blocos"])
+
+def liberta_blocos(mi):
+    """Esta função liberta os blocos sem parcelas alteradas, que voltam a
+    ser gerados iguais quando forem precisos
+
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+
+    Returns:
+        int: Número de blocos libertados
+    """
+    frios=[chave for chave,m in mi["blocos"].items() if obtem_numero_parcelas(m,"tapadas")==mi["lado"]**2]
+    for chave in frios:
+        del mi["blocos"][chave]
+    return len(frios)
+
+def verifica_blocos(mi): #Função auxiliar de limpa_infinito e marca_infinito
+    if len(mi["blocos"])>mi["maximo_blocos"]:
+        liberta_blocos(mi)
+
+def obtem_parcela_infinita(mi,x,y):
+    """
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        x (int): Coluna
+        y (int): Linha
+
+    Returns:
+        int: Byte da parcela (x,y), com o mesmo formato das parcelas de um campo
+    """
+    lado=mi["lado"]
+    return obtem_bytes_campo(obtem_bloco(mi,x//lado,y//lado))[(y%lado)*lado+x%lado]
+
+def limpa_infinito(mi,x,y):
+    """Esta função limpa a parcela (x,y) e, se esta não tiver minas
+    vizinhas, as parcelas tapadas à sua volta, gerando os blocos a que a
+    limpeza em cascata chega
+
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        x (int): Coluna
+        y (int): Linha
+
+    Returns:
+        tuple: Lista das coordenadas das parcelas limpas e True se a parcela
+        (x,y) tinha uma mina
+    """
+    lado=mi["lado"]
+    m=obtem_bloco(mi,x//lado,y//lado)
+    i=(y%lado)*lado+x%lado
+    if not obtem_bytes_campo(m)[i] & (TAPADA|MARCADA):
+        return [],False
+    minada=bool(obtem_bytes_campo(m)[i] & MINADA)
+    altera_estado(m,i,LIMPA)
+    limpas,por_visitar=[(x,y)],[(x,y)]
+    while por_visitar:
+        x,y=por_visitar.pop()
+        parcela=obtem_parcela_infinita(mi,x,y)
+        if parcela>>4==0 and not parcela & MINADA:
+            for dx,dy in DESLOCAMENTOS:
+                vx,vy=x+dx,y+dy
+                m=obtem_bloco(mi,vx//lado,vy//lado)
+                v=(vy%lado)*lado+vx%lado
+                if obtem_bytes_campo(m)[v] & TAPADA:
+                    altera_estado(m,v,LIMPA)
+                    limpas.append((vx,vy))
+                    por_visitar.append((vx,vy))
+    verifica_blocos(mi)
+    return limpas,minada
+
+def marca_infinito(mi,x,y):
+    """Esta função alterna a bandeira da parcela (x,y)
+
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        x (int): Coluna
+        y (int): Linha
+
+    Returns:
+        bool: True se a parcela foi modificada e False se estava limpa
+    """
+    lado=mi["lado"]
+    alterada=alterna_bandeira_indice(obtem_bloco(mi,x//lado,y//lado),(y%lado)*lado+x%lado)
+    verifica_blocos(mi)
+    return alterada
+
+def janela_para_str(mi,x,y,largura,altura):
+    """Esta função representa uma janela do campo infinito, gerando os
+    blocos que ela mostra
+
+    Args:
+        mi (TAD campo_infinito): Campo infinito
+        x (int): Coluna do canto superior esquerdo
+        y (int): Linha do canto superior esquerdo
+        largura (int): Número de colunas da janela
+        altura (int): Número de linhas da janela
+
+    Returns:
+        str: Linhas da janela com os mesmos carateres de campo_para_str
+    """
+    lado,linhas=mi["lado"],[]
+    for yy in range(y,y+altura):
+        partes,xx=[],x
+        while xx<x+largura:
+            fim=min(x+largura,(xx//lado+1)*lado) #fim da parte desta linha dentro do bloco
+            inicio=(yy%lado)*lado+xx%lado
+            partes.append(obtem_bytes_campo(obtem_bloco(mi,xx//lado,yy//lado))[inicio:inicio+fim-xx])
+            xx=fim
+        linhas.append(b"".join(partes).translate(TABELA_SIMBOLOS).decode("ascii"))
+    return "\n".join(linhas)
\ No newline at end of file
@@ -0,0 +1,159 @@
+#Formato binário compacto para guardar e ler sessões do jogo das minas
+#
+#Cada instantâneo tem um cabeçalho de 28 bytes (little-endian):
+#  "MN", versão, bits (1 comprimido, 2 iniciada, 4 perdida, 8 gerador de 64 bits),
+#  colunas, linhas, minas, jogadas (uint32) e estado do gerador (uint64)
+#seguido de três planos de bits com um bit por parcela, linha a linha: parcelas
+#minadas, parcelas marcadas e parcelas limpas (as restantes estão tapadas).
+#Se estiver comprimido, os planos são precedidos do seu tamanho (uint32) e
+#comprimidos com zlib.
+import mmap
+import struct
+import zlib
+
+from Projeto_2 import MINADA, MARCADA, LIMPA, cria_campo, cria_gerador, obtem_estado, numero_para_coluna, \
+    obtem_parcela, obtem_coordenada_indice, esconde_mina, marca_parcela, limpa_parcela, \
+    obtem_dimensao_gerador, obtem_parcelas_campo, obtem_ultima_coluna, obtem_ultima_linha, coluna_para_numero, \
+    obtem_campo_sessao, obtem_gerador_sessao, obtem_minas_sessao, obtem_jogadas_sessao, \
+    sessao_iniciada, sessao_perdida, restaura_sessao
+
+VERSAO=1
+CABECALHO=struct.Struct("<2sBBIIIIQ")
+COMPRIMIDO,INICIADA,PERDIDA,GERADOR_64=1,2,4,8
+
+def empacota_bits(parcelas,bit):
+    """
+    Args:
+        parcelas (bytes): Parcelas de um campo, como em obtem_parcelas_campo
+        bit (int): MINADA, MARCADA ou LIMPA
+
+    Returns:
+        bytes: Plano de bits com o bit k a 1 se a parcela k tem o bit
+    """
+    tabela=bytes(ord("1") if parcela & bit else ord("0") for parcela in range(256))
+    digitos=parcelas.translate(tabela)[::-1].decode("ascii")
+    return int(digitos,2).to_bytes((len(parcelas)+7)//8,"little")
+
+def desempacota_bits(dados,n):
+    """
+    Args:
+        dados (bytes): Plano de bits
+        n (int): Número de parcelas
+
+    Returns:
+        str: Cadeia de n carateres "0" ou "1", um por parcela
+    """
+    return format(int.from_bytes(dados,"little"),"0%db"%(n))[::-1]
+
+def tamanho_instantaneo(colunas,linhas):
+    """
+    Args:
+        colunas (int): Número de colunas do campo
+        linhas (int): Número de linhas do campo
+
+    Returns:
+        int: Tamanho em bytes de um instantâneo não comprimido. Num ficheiro de
+        instantâneos não comprimidos do mesmo tamanho, o k-ésimo começa em
+        k*tamanho_instantaneo(colunas,linhas).
+    """
+    return CABECALHO.size+3*((colunas*linhas+7)//8)
+
+def sessao_para_bytes(j,comprimir=False):
+    """Esta função representa a sessão j no formato binário
+
+    Args:
+        j (TAD sessao): Sessão
+        comprimir (bool): Se True, os planos de bits são comprimidos com zlib
+
+    Returns:
+        bytes: Instantâneo da sessão
+    """
+    m,g=obtem_campo_sessao(j),obtem_gerador_sessao(j)
+    bits=(COMPRIMIDO if comprimir else 0)|(INICIADA if sessao_iniciada(j) else 0)\
+        |(PERDIDA if sessao_perdida(j) else 0)|(GERADOR_64 if obtem_dimensao_gerador(g)==64 else 0)
+    cabecalho=CABECALHO.pack(b"MN",VERSAO,bits,coluna_para_numero(obtem_ultima_coluna(m)),\
+        obtem_ultima_linha(m),obtem_minas_sessao(j),obtem_jogadas_sessao(j),obtem_estado(g))
+    parcelas=obtem_parcelas_campo(m)
+    planos=b"".join([empacota_bits(parcelas,bit) for bit in (MINADA,MARCADA,LIMPA)])
+    if comprimir:
+        planos=zlib.compress(planos,9)
+        return cabecalho+struct.pack("<I",len(planos))+planos
+    return cabecalho+planos
+
+def bytes_para_sessao(dados,inicio=0):
+    """Esta função lê uma sessão no formato binário
+
+    Args:
+        dados (bytes): Bytes, memoryview ou mmap com um ou mais instantâneos
+        inicio (int): Posição do instantâneo em dados
+
+    Raises:
+        ValueError: Levanta erro se não houver um instantâneo válido e
+        completo em inicio, por exemplo no fim de um ficheiro cuja escrita
+        foi interrompida
+
+    Returns:
+        tuple: Sessão lida e posição do fim do instantâneo em dados
+    """
+    if len(dados)-inicio<CABECALHO.size:
+        raise ValueError ("bytes_para_sessao: argumentos invalidos")
+    marca,versao,bits,colunas,linhas,n,jogadas,estado=CABECALHO.unpack_from(dados,inicio)
+    if marca!=b"MN" or versao!=VERSAO:
+        raise ValueError ("bytes_para_sessao: argumentos invalidos")
+    inicio+=CABECALHO.size
+    tamanho_plano=(colunas*linhas+7)//8
+    try:
+        if bits & COMPRIMIDO:
+            tamanho=struct.unpack_from("<I",dados,inicio)[0]
+            fim=inicio+4+tamanho
+            planos=zlib.decompress(dados[inicio+4:fim])
+        else:
+            fim=inicio+3*tamanho_plano
+            planos=bytes(dados[inicio:fim])
+    except (struct.error,zlib.error):
+        raise ValueError ("bytes_para_sessao: argumentos invalidos")
+    if fim>len(dados) or len(planos)!=3*tamanho_plano or colunas<1 or linhas<1:
+        raise ValueError ("bytes_para_sessao: argumentos invalidos")
+    m=cria_campo(numero_para_coluna(colunas),linhas)
+    for plano,altera in enumerate((esconde_mina,marca_parcela,limpa_parcela)):
+        digitos=desempacota_bits(planos[plano*tamanho_plano:(plano+1)*tamanho_plano],colunas*linhas)
+        k=digitos.find("1")
+        while k!=-1:
+            altera(obtem_parcela(m,obtem_coordenada_indice(m,k)))
+            k=digitos.find("1",k+1)
+    g=cria_gerador(64 if bits & GERADOR_64 else 32,estado)
+    return restaura_sessao(m,g,n,bool(bits & INICIADA),bool(bits & PERDIDA),jogadas),fim
+
+def grava_instantaneos(caminho,sessoes,comprimir=False):
+    """Esta função acrescenta ao ficheiro os instantâneos das sessões
+
+    Args:
+        caminho (str): Caminho do ficheiro
+        sessoes (iterable): Sessões a guardar
+        comprimir (bool): Se True, os instantâneos são comprimidos
+
+    Returns:
+        int: Número de sessões guardadas
+    """
+    n=0
+    with open(caminho,"ab") as ficheiro:
+        for j in sessoes:
+            ficheiro.write(sessao_para_bytes(j,comprimir))
+            n+=1
+    return n
+
+def le_instantaneos(caminho):
+    """Esta função lê, por ordem, os instantâneos de um ficheiro mapeado em memória
+
+    Args:
+        caminho (str): Caminho do ficheiro
+
+    Returns:
+        generator: Sessões guardadas no ficheiro
+    """
+    with open(caminho,"rb") as ficheiro, \
+        mmap.mmap(ficheiro.fileno(),0,access=mmap.ACCESS_READ) as dados:
+        inicio=0
+        while inicio<len(dados):
+            j,inicio=bytes_para_sessao(dados,inicio)
+            yield j
\ No newline at end of file
@@ -0,0 +1,139 @@
+#Probabilidade exata de cada parcela tapada do jogo das minas esconder uma mina
+from math import comb
+
+from Projeto_2 import TAPADA, obtem_coordenada_indice, obtem_numero_parcelas, obtem_bytes_campo
+from solucionador import obtem_restricoes, obtem_componentes, enumera_componente
+
+def convolui(a,b):
+    """
+    Args:
+        a (list): Número de soluções para cada número de minas
+        b (list): Número de soluções para cada número de minas
+
+    Returns:
+        list: Número de soluções das duas partes em conjunto para cada
+        número total de minas
+    """
+    res=[0]*(len(a)+len(b)-1)
+    for ka,na in enumerate(a):
+        if na:
+            for kb,nb in enumerate(b):
+                res[ka+kb]+=na*nb
+    return res
+
+def divide(a,b):
+    """
+    Args:
+        a (list): Número de soluções para cada número de minas de um conjunto
+        de componentes que inclui a componente b
+        b (list): Número de soluções para cada número de minas da componente b
+
+    Returns:
+        list: Número de soluções das restantes componentes para cada número de
+        minas, obtido por divisão exata de polinómios
+    """
+    k0=next(k for k,nb in enumerate(b) if nb) #menor número de minas com soluções
+    res=[0]*(len(a)-len(b)+1)
+    for j in range(len(res)):
+        resto=a[j+k0]
+        for i in range(1,min(j,len(b)-1-k0)+1):
+            resto-=b[k0+i]*res[j-i]
+        res[j]=resto//b[k0]
+    return res
+
+def enumera_com_cache(parcelas,restricoes,cache,usadas):
+    """
+    Args:
+        parcelas (list): Posições da componente
+        restricoes (list): Restrições da componente
+        cache (dict): Resultados de chamadas anteriores, ou None
+        usadas (dict): Resultados usados nesta chamada, que passam a ser a cache
+
+    Returns:
+        dict: Para cada número de minas k, o número de soluções com k minas e
+        um dicionário com o número dessas soluções em que cada posição tem mina
+    """
+    chave=frozenset(restricoes) #uma componente que não mudou tem as mesmas restrições
+    if cache is not None and chave in cache:
+        usadas[chave]=cache[chave]
+        return usadas[chave]
+    usadas[chave]={k:(numero,dict(zip(parcelas,contagens))) \
+        for k,(numero,contagens) in enumera_componente(parcelas,restricoes).items()}
+    return usadas[chave]
+
+def calcula_probabilidades_indices(m,n,cache=None):
+    """Esta função calcula a probabilidade de cada parcela tapada do campo
+    esconder uma mina, a partir dos números visíveis, das bandeiras (tomadas
+    como minas) e do número total de minas. A fronteira é dividida em
+    componentes independentes, enumeradas em separado, e as parcelas
+    interiores são contadas com coeficientes binomiais.
+
+    Args:
+        m (TAD campo): Campo
+        n (int): Número total de minas do campo
+        cache (dict): Dicionário mantido pelo chamador entre jogadas. Só as
+        componentes que mudaram desde a última chamada são enumeradas.
+
+    Raises:
+        ValueError: Levanta erro se o estado visível do campo não tiver
+        nenhuma distribuição de minas possível
+
+    Returns:
+        dict: Probabilidade de ter mina de cada posição tapada
+    """
+    componentes=obtem_componentes(obtem_restricoes(m))
+    usadas={}
+    resultados=[enumera_com_cache(parcelas,restricoes,cache,usadas) for parcelas,restricoes in componentes]
+    if cache is not None:
+        cache.clear()
+        cache.update(usadas)
+    fronteira=set()
+    for parcelas,_ in componentes:
+        fronteira.update(parcelas)
+    interiores=[i for i,parcela in enumerate(obtem_bytes_campo(m)) if parcela & TAPADA and i not in fronteira]
+    minas,u=n-obtem_numero_parcelas(m,"marcadas"),len(interiores)
+
+    #formas[x] é o número de formas de pôr as restantes minas no interior
+    #quando há x minas na fronteira
+    formas=[comb(u,minas-x) if minas>=x else 0 for x in range(len(fronteira)+1)]
+    distribuicoes=[]
+    for (parcelas,_),resultado in zip(componentes,resultados):
+        distribuicao=[0]*(len(parcelas)+1)
+        for k,(numero,_) in resultado.items():
+            distribuicao[k]=numero
+        distribuicoes.append(distribuicao)
+    todas=[1]
+    for distribuicao in distribuicoes:
+        todas=convolui(todas,distribuicao)
+    total=sum(numero*formas[x] for x,numero in enumerate(todas))
+    if total==0:
+        raise ValueError ("calcula_probabilidades: estado do campo inconsistente")
+    probabilidades={}
+    for distribuicao,resultado in zip(distribuicoes,resultados):
+        outras=divide(todas,distribuicao)
+        contagens={}
+        for k,(_,por_parcela) in resultado.items():
+            peso=sum(numero*formas[k+x] for x,numero in enumerate(outras) if numero)
+            for i,contagem in por_parcela.items():
+                contagens[i]=contagens.get(i,0)+contagem*peso
+        for i,contagem in contagens.items():
+            probabilidades[i]=contagem/total
+    if interiores:
+        interior=sum(numero*comb(u-1,minas-x-1) for x,numero in enumerate(todas) if minas>x)/total
+        for i in interiores:
+            probabilidades[i]=interior
+    return probabilidades
+
+def calcula_probabilidades(m,n,cache=None):
+    """Esta função calcula, como calcula_probabilidades_indices, a
+    probabilidade de cada parcela tapada do campo esconder uma mina
+
+    Args:
+        m (TAD campo): Campo
+        n (int): Número total de minas do campo
+        cache (dict): Dicionário mantido pelo chamador entre jogadas
+
+    Returns:
+        dict: Probabilidade de ter mina de cada coordenada tapada
+    """
+    return {obtem_coordenada_indice(m,i):p for i,p in calcula_probabilidades_indices(m,n,cache).items()}
\ No newline at end of file
@@ -0,0 +1,178 @@
+#Registo de jogadas do jogo das minas e repetição determinística de um jogo
+#
+#Um jogo fica determinado por (c,l,n,d,s) e pela sequência de ações. O registo
+#é um ficheiro de texto onde só se acrescentam linhas:
+#  minas c l n d s          cabeçalho, na primeira linha
+#  L B03 / M B03            uma linha por jogada, incluindo a primeira
+#  P k instantâneo          ponto de controlo: sessão depois de k jogadas, no
+#                           formato de instantaneos.py comprimido e em base64
+import base64
+import sys
+
+from Projeto_2 import cria_sessao, primeira_jogada, limpar, marcar, coordenada_para_str, \
+    str_para_coordenada, obtem_campo_sessao, obtem_jogadas_sessao, sessao_iniciada, campo_para_str
+from instantaneos import sessao_para_bytes, bytes_para_sessao
+
+INTERVALO_PONTOS=64 #jogadas entre pontos de controlo
+
+def aplica_jogada(j,acao,c):
+    """Esta função faz uma jogada na sessão j: a primeira jogada se a sessão
+    não foi iniciada, ou limpar ou marcar consoante a ação
+
+    Args:
+        j (TAD sessao): Sessão
+        acao (str): "L" para limpar ou "M" para marcar
+        c (TAD coordenada): Coordenada
+
+    Raises:
+        ValueError: Levanta erro se a ação não for "L" nem "M" ou se a
+        jogada não for válida
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    if acao not in ("L","M"):
+        raise ValueError ("aplica_jogada: argumentos invalidos")
+    if not sessao_iniciada(j):
+        return primeira_jogada(j,c)
+    return limpar(j,c) if acao=="L" else marcar(j,c)
+
+def cria_registo(caminho,c,l,n,d,s,intervalo=INTERVALO_PONTOS):
+    """Esta função cria uma sessão e o ficheiro onde as suas jogadas
+    são registadas
+
+    Args:
+        caminho (str): Caminho do ficheiro
+        c (str): Última coluna
+        l (int): Última linha
+        n (int): Número de parcelas com minas
+        d (int): Dimensão do gerador de números
+        s (int): Estado inicial ou seed
+        intervalo (int): Jogadas entre pontos de controlo, ou 0 para não
+        gravar pontos de controlo
+
+    Raises:
+        ValueError: Levanta erro caso os argumentos do jogo não sejam válidos
+
+    Returns:
+        dict: Registo com a sessão, o ficheiro aberto e o intervalo
+    """
+    j=cria_sessao(c,l,n,d,s)
+    ficheiro=open(caminho,"w")
+    ficheiro.write("minas %s %d %d %d %d\n" %(c,l,n,d,s))
+    ficheiro.flush()
+    return {"sessao":j,"ficheiro":ficheiro,"intervalo":intervalo}
+
+def obtem_sessao_registo(r):
+    """
+    Args:
+        r (dict): Registo
+
+    Returns:
+        TAD sessao: Sessão cujas jogadas são registadas
+    """
+    return r["sessao"]
+
+def regista_jogada(r,acao,c):
+    """Esta função faz uma jogada na sessão do registo e acrescenta-a ao
+    ficheiro, seguida de um ponto de controlo a cada intervalo jogadas
+
+    Args:
+        r (dict): Registo
+        acao (str): "L" para limpar ou "M" para marcar
+        c (TAD coordenada): Coordenada
+
+    Raises:
+        ValueError: Levanta erro se a jogada não for válida, caso em que
+        não é registada
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    j=r["sessao"]
+    estado=aplica_jogada(j,acao,c)
+    linhas="%s %s\n" %(acao,coordenada_para_str(c))
+    if r["intervalo"] and obtem_jogadas_sessao(j)%r["intervalo"]==0:
+        linhas+="P %d %s\n" %(obtem_jogadas_sessao(j),\
+            base64.b64encode(sessao_para_bytes(j,True)).decode("ascii"))
+    r["ficheiro"].write(linhas)
+    r["ficheiro"].flush()
+    return estado
+
+def fecha_registo(r):
+    """
+    Args:
+        r (dict): Registo
+    """
+    r["ficheiro"].close()
+
+def le_registo(caminho):
+    """Esta função lê um ficheiro de registo sem repetir as jogadas
+
+    Args:
+        caminho (str): Caminho do ficheiro
+
+    Raises:
+        ValueError: Levanta erro se o ficheiro não for um registo válido ou
+        tiver uma linha completa que não se consegue ler
+
+    Returns:
+        tuple: Argumentos do jogo (c,l,n,d,s), lista das jogadas (ação,
+        coordenada) e dicionário com o instantâneo de cada ponto de controlo,
+        indexado pelo número de jogadas. Uma última linha sem fim de linha,
+        de um registo interrompido, é ignorada.
+    """
+    with open(caminho) as ficheiro:
+        cabecalho=ficheiro.readline().split()
+        if len(cabecalho)!=6 or cabecalho[0]!="minas":
+            raise ValueError ("le_registo: argumentos invalidos")
+        especificacao=(cabecalho[1],)+tuple(int(x) for x in cabecalho[2:])
+        jogadas,pontos=[],{}
+        for linha in ficheiro:
+            if not linha.endswith("\n"): #linha incompleta no fim de um registo interrompido
+                break
+            campos=linha.split()
+            try:
+                if len(campos)==2 and campos[0] in ("L","M"):
+                    jogadas.append((campos[0],str_para_coordenada(campos[1])))
+                elif len(campos)==3 and campos[0]=="P":
+                    pontos[int(campos[1])]=base64.b64decode(campos[2],validate=True)
+                elif campos:
+                    raise ValueError ("le_registo: argumentos invalidos")
+            except ValueError: #binascii.Error também é um ValueError
+                raise ValueError ("le_registo: argumentos invalidos")
+    return especificacao,jogadas,pontos
+
+def repete(caminho,k=None):
+    """Esta função reconstrói a sessão de um registo depois de k jogadas,
+    partindo do último ponto de controlo antes de k e repetindo só as
+    jogadas seguintes, sem desenhar o campo nem pedir input
+
+    Args:
+        caminho (str): Caminho do ficheiro
+        k (int): Número de jogadas, por omissão todas as do registo
+
+    Raises:
+        ValueError: Levanta erro se o registo não tiver k jogadas
+
+    Returns:
+        TAD sessao: Sessão depois de k jogadas
+    """
+    especificacao,jogadas,pontos=le_registo(caminho)
+    if k is None:
+        k=len(jogadas)
+    if not 0<=k<=len(jogadas):
+        raise ValueError ("repete: argumentos invalidos")
+    inicio=max((p for p in pontos if p<=k),default=0)
+    if inicio:
+        j=bytes_para_sessao(pontos[inicio])[0]
+    else:
+        j=cria_sessao(*especificacao)
+    for acao,c in jogadas[inicio:k]:
+        aplica_jogada(j,acao,c)
+    return j
+
+if __name__=="__main__":
+    #python repeticao.py registo [k]
+    j=repete(sys.argv[1],int(sys.argv[2]) if len(sys.argv)>2 else None)
+    print(campo_para_str(obtem_campo_sessao(j)))
\ No newline at end of file
@@ -0,0 +1,92 @@
+#Geração de campos que se resolvem só com lógica a partir da primeira jogada
+import multiprocessing
+
+from Projeto_2 import MINADA, MARCADA, TAPADA, cria_copia_campo, obtem_indice, \
+    coloca_minas_indices, limpa_campo_indices, altera_estado, esconde_mina, jogo_ganho, \
+    obtem_estado, define_estado, obtem_bytes_campo
+from solucionador import deduz
+
+def eh_campo_sem_palpites(m,i,n):
+    """Esta função joga numa cópia do campo m, a partir da posição i, apenas
+    com as jogadas deduzidas pelo solucionador.
+
+    Args:
+        m (TAD campo): Campo com as minas escondidas e todas as parcelas tapadas
+        i (int): Posição da primeira jogada
+        n (int): Número de minas
+
+    Returns:
+        bool: True se o campo fica resolvido sem nenhum palpite
+    """
+    m=cria_copia_campo(m)
+    limpa_campo_indices(m,i)
+    while not jogo_ganho(m):
+        seguras,minadas,_=deduz(m,n)
+        if not seguras and not minadas:
+            return False
+        for k in minadas:
+            altera_estado(m,k,MARCADA)
+        for k in seguras:
+            if obtem_bytes_campo(m)[k] & TAPADA:
+                limpa_campo_indices(m,k)
+    return True
+
+def avalia_candidato(candidato): #Função auxiliar executada nos processos
+    m,i,n=candidato
+    return eh_campo_sem_palpites(m,i,n)
+
+def coloca_minas_sem_palpites(m,c,g,n,processos=None,pool=None,max_candidatos=10000):
+    """Esta função modifica destrutivamente o campo m escondendo n minas como
+    coloca_minas, mas só aceita campos que se resolvem sem palpites a partir
+    da coordenada c. Os campos candidatos são gerados em sequência com o
+    gerador g, a partir do seu estado atual, e avaliados em paralelo; é
+    escolhido o primeiro candidato aceite, pelo que o campo só depende de
+    (m,c,g,n). Se o primeiro candidato for aceite, o campo é o de coloca_minas.
+
+    Args:
+        m (TAD campo): Campo sem minas
+        c (TAD coordenada): Coordenada da primeira jogada
+        g (TAD gerador): Gerador, que fica no estado seguinte ao candidato escolhido
+        n (int): Número de minas
+        processos (int): Número de processos, por omissão o número de CPUs.
+        Com 1 os candidatos são avaliados no próprio processo.
+        pool (multiprocessing.Pool): Conjunto de processos já criado, a reutilizar
+        max_candidatos (int): Número máximo de candidatos a gerar
+
+    Raises:
+        ValueError: Levanta erro se nenhum dos candidatos for aceite
+
+    Returns:
+        TAD campo: Campo m com as minas escondidas
+    """
+    i=obtem_indice(m,c)
+    processos=processos or multiprocessing.cpu_count()
+    proprio=pool is None and processos>1
+    if proprio:
+        pool=multiprocessing.Pool(processos)
+    try:
+        gerados=0
+        while gerados<max_candidatos:
+            candidatos,estados=[],[]
+            for _ in range(min(4*processos,max_candidatos-gerados)):
+                candidato=cria_copia_campo(m)
+                coloca_minas_indices(candidato,i,g,n)
+                candidatos.append((candidato,i,n))
+                estados.append(obtem_estado(g))
+            gerados+=len(candidatos)
+            if processos==1:
+                aceites=map(avalia_candidato,candidatos)
+            else:
+                aceites=pool.map(avalia_candidato,candidatos)
+            for (candidato,_,_),estado,aceite in zip(candidatos,estados,aceites):
+                if aceite:
+                    define_estado(g,estado)
+                    for k,parcela in enumerate(obtem_bytes_campo(candidato)):
+                        if parcela & MINADA:
+                            esconde_mina([m,k])
+                    return m
+    finally:
+        if proprio:
+            pool.close()
+            pool.join()
+    raise ValueError ("coloca_minas_sem_palpites: nenhum campo sem palpites encontrado")
\ No newline at end of file
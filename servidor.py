@@ -0,0 +1,375 @@
+#Servidor TCP do jogo das minas, com muitas sessões num só processo asyncio
+#
+#Protocolo de linhas de texto, uma resposta por comando:
+#  NOVO c l n d s      cria uma sessão                      OK identificador
+#  L id B03            limpa (a primeira jogada é um L)     OK estado
+#  M id B03            alterna a bandeira                   OK estado
+#  A id B03            limpa as vizinhas (acorde)           OK estado
+#  ESTADO id           estado e número de jogadas           OK estado jogadas
+#  VER id              campo como em campo_para_str         OK k, seguido de k linhas
+#  SAIR                fecha a ligação                      OK
+#Um comando inválido tem a resposta ERRO seguida da mensagem.
+#
+#As sessões sem jogadas há mais de INATIVIDADE segundos, ou as menos usadas se
+#houver mais de MAXIMO_SESSOES, são guardadas na pasta de instantâneos e lidas
+#de novo quando voltam a ser usadas. As jogadas que podem limpar muitas
+#parcelas, a leitura de instantâneos e a representação de campos grandes são
+#feitas no conjunto de trabalhadores, para não pararem o ciclo de eventos.
+import asyncio
+import concurrent.futures
+import os
+import secrets
+import sys
+
+from Projeto_2 import cria_sessao, primeira_jogada, limpar, marcar, limpar_acorde, esquece_historico, \
+    obtem_campo_sessao, obtem_estado_sessao, obtem_jogadas_sessao, sessao_iniciada, \
+    eh_str_coordenada_do_campo, str_para_coordenada, campo_para_str, coluna_para_numero, eh_nome_coluna, \
+    obtem_ultima_coluna, obtem_ultima_linha
+from instantaneos import sessao_para_bytes, bytes_para_sessao
+
+PORTA=8765
+INATIVIDADE=300 #segundos sem jogadas até a sessão ser guardada
+MAXIMO_SESSOES=4096 #sessões em memória
+MAXIMO_PARCELAS=1<<20 #parcelas do maior campo aceite
+LIMITE_LOCAL=4096 #parcelas acima das quais as jogadas pesadas vão para os trabalhadores
+MAXIMO_LINHA=1024 #carateres de um comando
+ACOES={"L":limpar,"M":marcar,"A":limpar_acorde}
+
+def cria_servidor(pasta,inatividade=INATIVIDADE,maximo_sessoes=MAXIMO_SESSOES,trabalhadores=None):
+    """
+    Args:
+        pasta (str): Pasta onde as sessões inativas são guardadas, criada se
+        não existir
+        inatividade (float): Segundos sem jogadas até uma sessão ser guardada
+        maximo_sessoes (int): Número máximo de sessões em memória
+        trabalhadores (int): Número de threads do conjunto de trabalhadores,
+        por omissão o escolhido por concurrent.futures
+
+    Returns:
+        dict: Servidor com as sessões em memória, indexadas pelo identificador
+    """
+    os.makedirs(pasta,exist_ok=True)
+    return {"pasta":pasta,"inatividade":inatividade,"maximo_sessoes":maximo_sessoes,"sessoes":{},\
+        "trabalhadores":concurrent.futures.ThreadPoolExecutor(trabalhadores)}
+
+def obtem_caminho_sessao(servidor,ident):
+    """
+    Args:
+        servidor (dict): Servidor
+        ident (str): Identificador da sessão
+
+    Returns:
+        str: Caminho do instantâneo da sessão na pasta do servidor
+    """
+    return os.path.join(servidor["pasta"],"%s.mn" %(ident))
+
+def eh_identificador(arg):
+    """
+    Args:
+        arg (universal): Argumento universal
+
+    Returns:
+        bool: True se arg pode ser o identificador de uma sessão
+    """
+    return type(arg)==str and len(arg)==16 and all(x in "0123456789abcdef" for x in arg)
+
+def joga(j,acao,texto):
+    """Esta função faz uma jogada na sessão j, validando a ação e a
+    coordenada como turno_jogador, e esquece depois o histórico da sessão,
+    para que a memória de cada sessão dependa só do tamanho do campo
+
+    Args:
+        j (TAD sessao): Sessão
+        acao (str): "L", "M" ou "A"
+        texto (str): Coordenada escrita como em coordenada_para_str
+
+    Raises:
+        ValueError: Levanta erro se a jogada não for válida
+
+    Returns:
+        str: Estado da sessão depois da jogada
+    """
+    if acao not in ACOES or not eh_str_coordenada_do_campo(obtem_campo_sessao(j),texto):
+        raise ValueError ("joga: argumentos invalidos")
+    c=str_para_coordenada(texto)
+    if acao=="L" and not sessao_iniciada(j):
+        estado=primeira_jogada(j,c)
+    else:
+        estado=ACOES[acao](j,c)
+    esquece_historico(j)
+    return estado
+
+def eh_sessao_grande(j):
+    """
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        bool: True se o campo da sessão j tem mais de LIMITE_LOCAL parcelas
+    """
+    m=obtem_campo_sessao(j)
+    return coluna_para_numero(obtem_ultima_coluna(m))*obtem_ultima_linha(m)>LIMITE_LOCAL
+
+def le_sessao(caminho): #Função auxiliar de usa_sessao, executada nos trabalhadores
+    with open(caminho,"rb") as ficheiro:
+        return bytes_para_sessao(ficheiro.read())[0]
+
+def grava_sessao(caminho,dados): #Função auxiliar de guarda_sessao, executada nos trabalhadores
+    with open(caminho+".tmp","wb") as ficheiro:
+        ficheiro.write(dados)
+    os.replace(caminho+".tmp",caminho)
+
+async def trabalha(servidor,funcao,*args):
+    """
+    Args:
+        servidor (dict): Servidor
+        funcao (function): Função a executar nos trabalhadores
+
+    Returns:
+        universal: Resultado de funcao(*args)
+    """
+    return await asyncio.get_running_loop().run_in_executor(servidor["trabalhadores"],funcao,*args)
+
+def obtem_entrada(servidor,ident):
+    """Esta função devolve a entrada da sessão ident, criando-a vazia se a
+    sessão não estiver em memória. O trinco da entrada ordena os comandos
+    sobre a mesma sessão.
+
+    Args:
+        servidor (dict): Servidor
+        ident (str): Identificador da sessão
+
+    Returns:
+        dict: Entrada com a sessão (None se não estiver em memória), o
+        trinco, o número de comandos à espera, se está a ser guardada e o
+        instante da última jogada
+    """
+    entrada=servidor["sessoes"].get(ident)
+    if entrada is None:
+        entrada={"sessao":None,"trinco":asyncio.Lock(),"utilizadores":0,"a_guardar":False,\
+            "ultimo":asyncio.get_running_loop().time()}
+        servidor["sessoes"][ident]=entrada
+    return entrada
+
+def liberta_entrada(servidor,ident,entrada): #Função auxiliar de usa_sessao e guarda_sessao
+    if entrada["sessao"] is None and entrada["utilizadores"]==0 and servidor["sessoes"].get(ident) is entrada:
+        del servidor["sessoes"][ident]
+
+async def usa_sessao(servidor,ident,funcao,pesada=False):
+    """Esta função aplica funcao à sessão ident, lendo-a primeiro da pasta
+    se tiver sido guardada
+
+    Args:
+        servidor (dict): Servidor
+        ident (str): Identificador da sessão
+        funcao (function): Função que recebe a sessão
+        pesada (bool): Se True e o campo for grande, funcao é executada
+        nos trabalhadores
+
+    Raises:
+        ValueError: Levanta erro se a sessão não existir ou se funcao o levantar
+
+    Returns:
+        universal: Resultado de funcao
+    """
+    if not eh_identificador(ident):
+        raise ValueError ("usa_sessao: argumentos invalidos")
+    entrada=obtem_entrada(servidor,ident)
+    entrada["utilizadores"]+=1
+    try:
+        async with entrada["trinco"]:
+            if entrada["sessao"] is None:
+                caminho=obtem_caminho_sessao(servidor,ident)
+                if not os.path.exists(caminho):
+                    raise ValueError ("usa_sessao: argumentos invalidos")
+                entrada["sessao"]=await trabalha(servidor,le_sessao,caminho)
+                limita_sessoes(servidor)
+            entrada["ultimo"]=asyncio.get_running_loop().time()
+            if pesada and eh_sessao_grande(entrada["sessao"]):
+                return await trabalha(servidor,funcao,entrada["sessao"])
+            return funcao(entrada["sessao"])
+    finally:
+        entrada["utilizadores"]-=1
+        liberta_entrada(servidor,ident,entrada)
+
+async def guarda_sessao(servidor,ident):
+    """Esta função guarda a sessão ident na pasta do servidor e retira-a
+    da memória
+
+    Args:
+        servidor (dict): Servidor
+        ident (str): Identificador da sessão
+    """
+    entrada=servidor["sessoes"].get(ident)
+    if entrada is None:
+        return
+    entrada["utilizadores"]+=1
+    entrada["a_guardar"]=True
+    try:
+        async with entrada["trinco"]:
+            if entrada["sessao"] is not None:
+                dados=await trabalha(servidor,sessao_para_bytes,entrada["sessao"],True)
+                await trabalha(servidor,grava_sessao,obtem_caminho_sessao(servidor,ident),dados)
+                entrada["sessao"]=None
+    finally:
+        entrada["utilizadores"]-=1
+        entrada["a_guardar"]=False
+        liberta_entrada(servidor,ident,entrada)
+
+def limita_sessoes(servidor):
+    """Esta função começa a guardar as sessões menos usadas, sem comandos
+    à espera, enquanto houver mais de maximo_sessoes em memória
+
+    Args:
+        servidor (dict): Servidor
+    """
+    excesso=len(servidor["sessoes"])-servidor["maximo_sessoes"] \
+        -sum(e["a_guardar"] for e in servidor["sessoes"].values())
+    if excesso>0:
+        vivas=[(e["ultimo"],ident) for ident,e in servidor["sessoes"].items() \
+            if e["sessao"] is not None and e["utilizadores"]==0]
+        for _,ident in sorted(vivas)[:excesso]:
+            servidor["sessoes"][ident]["a_guardar"]=True
+            asyncio.create_task(guarda_sessao(servidor,ident))
+
+async def guarda_inativas(servidor):
+    """Esta função guarda, a cada segundo, as sessões sem jogadas há mais
+    de inatividade segundos
+
+    Args:
+        servidor (dict): Servidor
+    """
+    while True:
+        await asyncio.sleep(min(1,servidor["inatividade"]))
+        limite=asyncio.get_running_loop().time()-servidor["inatividade"]
+        inativas=[ident for ident,e in servidor["sessoes"].items() \
+            if e["sessao"] is not None and e["utilizadores"]==0 and e["ultimo"]<limite]
+        await asyncio.gather(*[guarda_sessao(servidor,ident) for ident in inativas])
+
+async def guarda_todas(servidor):
+    """Esta função guarda todas as sessões em memória, por exemplo antes de
+    o servidor terminar
+
+    Args:
+        servidor (dict): Servidor
+    """
+    await asyncio.gather(*[guarda_sessao(servidor,ident) for ident in list(servidor["sessoes"])])
+
+async def novo(servidor,c,l,n,d,s):
+    """
+    Args:
+        servidor (dict): Servidor
+        c (str): Última coluna
+        l (str): Última linha
+        n (str): Número de parcelas com minas
+        d (str): Dimensão do gerador de números
+        s (str): Estado inicial ou seed
+
+    Raises:
+        ValueError: Levanta erro se os argumentos do jogo não forem válidos
+        ou o campo tiver mais de MAXIMO_PARCELAS parcelas
+
+    Returns:
+        str: Identificador da nova sessão
+    """
+    if not (eh_nome_coluna(c) and all(x.isdigit() for x in (l,n,d,s)) \
+        and coluna_para_numero(c)*int(l)<=MAXIMO_PARCELAS):
+        raise ValueError ("novo: argumentos invalidos")
+    j=cria_sessao(c,int(l),int(n),int(d),int(s))
+    ident=secrets.token_hex(8)
+    while ident in servidor["sessoes"] or os.path.exists(obtem_caminho_sessao(servidor,ident)):
+        ident=secrets.token_hex(8)
+    obtem_entrada(servidor,ident)["sessao"]=j
+    limita_sessoes(servidor)
+    return ident
+
+def descreve_sessao(j): #Função auxiliar de executa_comando
+    return "%s %d" %(obtem_estado_sessao(j),obtem_jogadas_sessao(j))
+
+def representa_sessao(j): #Função auxiliar de executa_comando
+    linhas=campo_para_str(obtem_campo_sessao(j)).split("\n")
+    return "%d\n%s" %(len(linhas),"\n".join(linhas))
+
+async def executa_comando(servidor,linha):
+    """
+    Args:
+        servidor (dict): Servidor
+        linha (str): Comando do protocolo, sem o fim de linha
+
+    Returns:
+        str: Resposta ao comando, sem o último fim de linha
+    """
+    campos=linha.split()
+    try:
+        if len(campos)==6 and campos[0]=="NOVO":
+            return "OK %s" %(await novo(servidor,*campos[1:]))
+        elif len(campos)==3 and campos[0] in ACOES:
+            acao,texto=campos[0],campos[2]
+            return "OK %s" %(await usa_sessao(servidor,campos[1],lambda j: joga(j,acao,texto),acao!="M"))
+        elif len(campos)==2 and campos[0]=="ESTADO":
+            return "OK %s" %(await usa_sessao(servidor,campos[1],descreve_sessao))
+        elif len(campos)==2 and campos[0]=="VER":
+            return "OK %s" %(await usa_sessao(servidor,campos[1],representa_sessao,True))
+    except ValueError as erro:
+        return "ERRO %s" %(erro)
+    except Exception as erro: #um erro inesperado perde só o comando, não a ligação
+        return "ERRO interno %s" %(type(erro).__name__)
+    return "ERRO comando invalido"
+
+async def trata_cliente(servidor,leitor,escritor):
+    """Esta função responde aos comandos de uma ligação até SAIR ou até o
+    cliente a fechar
+
+    Args:
+        servidor (dict): Servidor
+        leitor (asyncio.StreamReader): Leitor da ligação
+        escritor (asyncio.StreamWriter): Escritor da ligação
+    """
+    try:
+        while True:
+            try:
+                linha=await leitor.readline()
+            except ValueError: #linha com mais de MAXIMO_LINHA carateres
+                escritor.write(b"ERRO linha demasiado longa\n")
+                break
+            if not linha:
+                break
+            linha=linha.decode("ascii","replace").strip()
+            if linha=="SAIR":
+                escritor.write(b"OK\n")
+                break
+            escritor.write((await executa_comando(servidor,linha)+"\n").encode("ascii","replace"))
+            await escritor.drain()
+        await escritor.drain()
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+async def serve(servidor,anfitriao="127.0.0.1",porta=PORTA):
+    """Esta função aceita ligações até ser cancelada e guarda então todas
+    as sessões em memória
+
+    Args:
+        servidor (dict): Servidor
+        anfitriao (str): Endereço onde o servidor escuta
+        porta (int): Porta onde o servidor escuta
+    """
+    tcp=await asyncio.start_server(lambda leitor,escritor: trata_cliente(servidor,leitor,escritor),\
+        anfitriao,porta,limit=MAXIMO_LINHA)
+    inativas=asyncio.create_task(guarda_inativas(servidor))
+    try:
+        async with tcp:
+            await tcp.serve_forever()
+    finally:
+        inativas.cancel()
+        await guarda_todas(servidor)
+        servidor["trabalhadores"].shutdown()
+
+if __name__=="__main__":
+    #python servidor.py [porta] [pasta]
+    servidor=cria_servidor(sys.argv[2] if len(sys.argv)>2 else "sessoes")
+    try:
+        asyncio.run(serve(servidor,porta=int(sys.argv[1]) if len(sys.argv)>1 else PORTA))
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
@@ -0,0 +1,115 @@
+#Simulação de muitos jogos das minas, sem jogador humano, repartidos por vários processos
+import functools
+import multiprocessing
+import sys
+import time
+
+from Projeto_2 import cria_sessao, primeira_jogada, limpar, marcar, obtem_campo_sessao, \
+    obtem_estado_sessao, obtem_jogadas_sessao, obtem_coordenadas, obtem_numero_parcelas, \
+    obtem_ultima_coluna, obtem_ultima_linha, cria_coordenada, coluna_para_numero, numero_para_coluna
+
+def politica_primeira_tapada(j):
+    """Política de jogo simples: a primeira jogada é no centro do campo e as
+    seguintes limpam a primeira parcela tapada, da esquerda para a direita
+    e de cima para baixo.
+
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        tuple: Ação ("L" ou "M") e coordenada da próxima jogada
+    """
+    m=obtem_campo_sessao(j)
+    if obtem_estado_sessao(j)=="inicio":
+        return "L",cria_coordenada(numero_para_coluna((1+coluna_para_numero(obtem_ultima_coluna(m)))//2),\
+            (1+obtem_ultima_linha(m))//2)
+    return "L",obtem_coordenadas(m,"tapadas")[0]
+
+def joga_jogo(c,l,n,d,s,politica,max_jogadas=None):
+    """Esta função joga um jogo completo escolhendo as jogadas com a política
+
+    Args:
+        c (str): Última coluna
+        l (int): Última linha
+        n (int): Número de parcelas com minas
+        d (int): Dimensão do gerador de números
+        s (int): Estado inicial ou seed
+        politica (function): Função que recebe a sessão e devolve a ação
+        ("L" ou "M") e a coordenada da próxima jogada. Na primeira jogada
+        a ação é ignorada.
+        max_jogadas (int): Número máximo de jogadas, por omissão o dobro
+        do número de parcelas
+
+    Returns:
+        dict: Resultado do jogo com a seed, o estado final da sessão, se houve
+        vitória, o número de jogadas e o número de parcelas limpas
+    """
+    j=cria_sessao(c,l,n,d,s)
+    if max_jogadas is None:
+        max_jogadas=2*obtem_numero_parcelas(obtem_campo_sessao(j),"tapadas")
+    estado=primeira_jogada(j,politica(j)[1])
+    while estado=="em_curso" and obtem_jogadas_sessao(j)<max_jogadas:
+        acao,coordenada=politica(j)
+        estado=limpar(j,coordenada) if acao=="L" else marcar(j,coordenada)
+    return {"seed":s,"estado":estado,"vitoria":estado=="vitoria",\
+        "jogadas":obtem_jogadas_sessao(j),\
+            "limpas":obtem_numero_parcelas(obtem_campo_sessao(j),"limpas")}
+
+def joga_seed(especificacao,politica,s): #Função auxiliar executada nos processos
+    c,l,n,d=especificacao
+    return joga_jogo(c,l,n,d,s,politica)
+
+def simula(c,l,n,d,seeds,politica=politica_primeira_tapada,processos=None):
+    """Esta função joga um jogo por cada seed, repartindo as seeds por um
+    conjunto de processos, e devolve os resultados à medida que terminam.
+
+    Args:
+        c (str): Última coluna
+        l (int): Última linha
+        n (int): Número de parcelas com minas
+        d (int): Dimensão do gerador de números
+        seeds (iterable): Seeds dos jogos, por exemplo um range
+        politica (function): Política de jogo, definida ao nível de um módulo
+        para poder ser enviada aos processos
+        processos (int): Número de processos, por omissão o número de CPUs.
+        Com 1 os jogos são jogados no próprio processo.
+
+    Returns:
+        generator: Resultados dos jogos, pela ordem em que terminam
+    """
+    funcao=functools.partial(joga_seed,(c,l,n,d),politica)
+    if processos==1:
+        yield from map(funcao,seeds)
+        return
+    processos=processos or multiprocessing.cpu_count()
+    seeds=list(seeds)
+    with multiprocessing.Pool(processos) as pool:
+        yield from pool.imap_unordered(funcao,seeds,chunksize=max(1,len(seeds)//(8*processos)))
+
+def resume(resultados):
+    """
+    Args:
+        resultados (iterable): Resultados de simula
+
+    Returns:
+        dict: Número de jogos, de vitórias, taxa de vitória, média de
+        jogadas e de parcelas limpas, duração e jogos por segundo
+    """
+    inicio=time.perf_counter()
+    jogos=vitorias=jogadas=limpas=0
+    for r in resultados:
+        jogos+=1
+        vitorias+=r["vitoria"]
+        jogadas+=r["jogadas"]
+        limpas+=r["limpas"]
+    duracao=time.perf_counter()-inicio
+    return {"jogos":jogos,"vitorias":vitorias,"taxa_vitoria":vitorias/max(jogos,1),\
+        "media_jogadas":jogadas/max(jogos,1),"media_limpas":limpas/max(jogos,1),\
+            "segundos":duracao,"jogos_por_segundo":jogos/duracao if duracao else 0.0}
+
+if __name__=="__main__":
+    #python simulacao.py c l n d primeira_seed numero_de_jogos [processos]
+    c,l,n,d,s,k=sys.argv[1],int(sys.argv[2]),int(sys.argv[3]),int(sys.argv[4]),\
+        int(sys.argv[5]),int(sys.argv[6])
+    processos=int(sys.argv[7]) if len(sys.argv)>7 else None
+    print(resume(simula(c,l,n,d,range(s,s+k),processos=processos)))
\ No newline at end of file
@@ -0,0 +1,300 @@
+#Solucionador determinístico do jogo das minas que usa apenas o que o jogador vê:
+#parcelas tapadas, marcadas e os números das parcelas limpas
+from Projeto_2 import MINADA, TAPADA, MARCADA, LIMPA, obtem_funcao_vizinhos, \
+    obtem_coordenada_indice, obtem_campo_sessao, obtem_estado_sessao, obtem_minas_sessao, \
+    limpar, marcar, primeira_jogada, cria_coordenada, obtem_ultima_coluna, obtem_ultima_linha, \
+    coluna_para_numero, numero_para_coluna, obtem_numero_parcelas, obtem_bytes_campo
+
+LIMITE_ENUMERACAO=24 #número máximo de parcelas de uma componente a enumerar
+
+def obtem_restricoes(m):
+    """Esta função lê as restrições visíveis do campo: cada parcela limpa com
+    número e parcelas tapadas à volta indica quantas minas há entre essas
+    parcelas, contando as parcelas marcadas como minas.
+
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        list: Restrições (frozenset de posições tapadas, número de minas entre elas)
+    """
+    parcelas,vizinhos=obtem_bytes_campo(m),obtem_funcao_vizinhos(m)
+    restricoes,vistas=[],set()
+    for i,parcela in enumerate(parcelas):
+        if parcela & LIMPA and not parcela & MINADA and parcela>>4:
+            tapadas,minas=[],parcela>>4
+            for v in vizinhos(i):
+                if parcelas[v] & TAPADA:
+                    tapadas.append(v)
+                elif parcelas[v] & MARCADA:
+                    minas-=1
+            restricao=(frozenset(tapadas),minas)
+            if tapadas and restricao not in vistas:
+                vistas.add(restricao)
+                restricoes.append(restricao)
+    return restricoes
+
+def aplica_regras_simples(restricoes):
+    """
+    Args:
+        restricoes (list): Restrições de obtem_restricoes
+
+    Returns:
+        tuple: Conjuntos das posições seguras e das posições minadas que se
+        deduzem de cada restrição isolada e de pares de restrições em que uma
+        está contida na outra
+    """
+    seguras,minadas=set(),set()
+    por_parcela={}
+    for k,(tapadas,minas) in enumerate(restricoes):
+        if minas==0:
+            seguras|=tapadas
+        elif minas==len(tapadas):
+            minadas|=tapadas
+        for i in tapadas:
+            por_parcela.setdefault(i,[]).append(k)
+    if seguras or minadas:
+        return seguras,minadas
+    for a,(tapadas_a,minas_a) in enumerate(restricoes): #regras de subconjuntos
+        vizinhas=set()
+        for i in tapadas_a:
+            vizinhas.update(por_parcela[i])
+        for b in vizinhas:
+            tapadas_b,minas_b=restricoes[b]
+            if b!=a and tapadas_a<tapadas_b:
+                if minas_b==minas_a:
+                    seguras|=tapadas_b-tapadas_a
+                elif minas_b-minas_a==len(tapadas_b)-len(tapadas_a):
+                    minadas|=tapadas_b-tapadas_a
+    return seguras,minadas
+
+def obtem_componentes(restricoes):
+    """
+    Args:
+        restricoes (list): Restrições de obtem_restricoes
+
+    Returns:
+        list: Componentes independentes da fronteira, cada uma com a lista
+        das suas posições (por ordem de visita) e a lista das suas restrições
+    """
+    por_parcela={}
+    for k,(tapadas,_) in enumerate(restricoes):
+        for i in tapadas:
+            por_parcela.setdefault(i,[]).append(k)
+    componentes,vistas=[],set()
+    for inicio in sorted(por_parcela):
+        if inicio in vistas:
+            continue
+        parcelas,ids,por_visitar=[],set(),[inicio]
+        vistas.add(inicio)
+        while por_visitar:
+            i=por_visitar.pop(0)
+            parcelas.append(i)
+            for k in por_parcela[i]:
+                if k not in ids:
+                    ids.add(k)
+                    for v in sorted(restricoes[k][0]):
+                        if v not in vistas:
+                            vistas.add(v)
+                            por_visitar.append(v)
+        componentes.append((parcelas,[restricoes[k] for k in sorted(ids)]))
+    return componentes
+
+def soma_distribuicoes(destino,origem,desvio):
+    """Esta função acrescenta a destino as soluções de origem com mais
+    desvio minas
+
+    Args:
+        destino (dict): Número de soluções para cada número de minas
+        origem (dict): Número de soluções para cada número de minas
+        desvio (int): Minas a acrescentar
+    """
+    for minas,numero in origem.items():
+        destino[minas+desvio]=destino.get(minas+desvio,0)+numero
+
+def enumera_componente(parcelas,restricoes):
+    """Esta função conta todas as distribuições de minas pelas parcelas de
+    uma componente que satisfazem as suas restrições. As parcelas são
+    percorridas por ordem e as distribuições parciais são agrupadas pelas
+    minas que ainda faltam nas restrições abertas, pelo que o custo depende
+    da largura da fronteira e não do número de soluções.
+
+    Args:
+        parcelas (list): Posições da componente, por ordem de visita
+        restricoes (list): Restrições da componente
+
+    Returns:
+        dict: Para cada número total de minas k, o número de soluções com k
+        minas e a lista com o número dessas soluções em que cada parcela
+        tem mina
+    """
+    posicao={i:k for k,i in enumerate(parcelas)}
+    por_parcela=[[] for _ in parcelas]
+    ultima,livres_depois=[],[]
+    for r,(tapadas,_) in enumerate(restricoes):
+        posicoes=sorted(posicao[i] for i in tapadas)
+        ultima.append(posicoes[-1])
+        for j,k in enumerate(posicoes):
+            por_parcela[k].append((r,len(posicoes)-j-1)) #restrição e parcelas que faltam depois de k
+    #abertas[k] são as restrições com parcelas antes de k e a partir de k
+    abertas,ativas=[],set()
+    for k in range(len(parcelas)+1):
+        abertas.append(tuple(sorted(ativas)))
+        if k<len(parcelas):
+            ativas.update(r for r,_ in por_parcela[k])
+            ativas.difference_update(r for r,_ in por_parcela[k] if ultima[r]==k)
+    #caminho para a frente: distribuições das parcelas 0..k-1 por estado
+    frente=[{():{0:1}}]
+    transicoes=[]
+    for k in range(len(parcelas)):
+        seguinte,transicoes_k={},[]
+        for estado,distribuicao in frente[k].items():
+            faltam={r:minas for r,minas in zip(abertas[k],estado)}
+            for valor in (0,1):
+                novas,valido={},True
+                for r,livres in por_parcela[k]:
+                    novas[r]=faltam.get(r,restricoes[r][1])-valor
+                    if not 0<=novas[r]<=livres:
+                        valido=False
+                if valido:
+                    proximo=tuple(novas.get(r,faltam.get(r)) for r in abertas[k+1])
+                    soma_distribuicoes(seguinte.setdefault(proximo,{}),distribuicao,valor)
+                    transicoes_k.append((estado,valor,proximo))
+        frente.append(seguinte)
+        transicoes.append(transicoes_k)
+    #caminho para trás: distribuições das parcelas k..fim a partir de cada estado
+    tras=[None]*len(parcelas)+[{():{0:1}}]
+    for k in range(len(parcelas)-1,-1,-1):
+        tras[k]={}
+        for estado,valor,proximo in transicoes[k]:
+            if proximo in tras[k+1]: #estados sem continuação válida não chegam ao fim
+                soma_distribuicoes(tras[k].setdefault(estado,{}),tras[k+1][proximo],valor)
+    resultados={minas:[numero,[0]*len(parcelas)] for minas,numero in frente[-1].get((),{}).items()}
+    for k in range(len(parcelas)):
+        for estado,valor,proximo in transicoes[k]:
+            if valor and proximo in tras[k+1]:
+                for antes,numero_antes in frente[k][estado].items():
+                    for depois,numero_depois in tras[k+1][proximo].items():
+                        resultados[antes+1+depois][1][k]+=numero_antes*numero_depois
+    return {minas:(numero,contagens) for minas,(numero,contagens) in resultados.items()}
+
+def deduz(m,minas=None):
+    """Esta função deduz, a partir do estado visível do campo, parcelas
+    seguras e parcelas minadas: primeiro com regras de uma restrição, depois
+    com pares de restrições e por fim enumerando as componentes pequenas.
+
+    Args:
+        m (TAD campo): Campo
+        minas (int): Número total de minas, se conhecido
+
+    Returns:
+        tuple: Conjuntos das posições seguras e das posições minadas, e um
+        dicionário com a fração das soluções em que cada posição enumerada
+        tem mina
+    """
+    restricoes=obtem_restricoes(m)
+    seguras,minadas=aplica_regras_simples(restricoes)
+    frequencias={}
+    if seguras or minadas:
+        return seguras,minadas,frequencias
+    if minas is not None:
+        minas-=obtem_numero_parcelas(m,"marcadas")
+    for parcelas,restricoes_componente in obtem_componentes(restricoes):
+        if len(parcelas)>LIMITE_ENUMERACAO:
+            continue
+        solucoes=[0,[0]*len(parcelas)]
+        for k,(numero,contagens) in enumera_componente(parcelas,restricoes_componente).items():
+            if minas is None or k<=minas:
+                solucoes[0]+=numero
+                solucoes[1]=[a+b for a,b in zip(solucoes[1],contagens)]
+        if solucoes[0]==0:
+            continue
+        for i,contagem in zip(parcelas,solucoes[1]):
+            if contagem==0:
+                seguras.add(i)
+            elif contagem==solucoes[0]:
+                minadas.add(i)
+            frequencias[i]=contagem/solucoes[0]
+    return seguras,minadas,frequencias
+
+def escolhe_palpite(m,frequencias):
+    """
+    Args:
+        m (TAD campo): Campo
+        frequencias (dict): Frações de deduz
+
+    Returns:
+        int: Posição tapada com menor risco estimado: a de menor fração de
+        soluções com mina ou, se nenhuma for enumerada, a primeira tapada
+        fora da fronteira
+    """
+    if frequencias:
+        return min(sorted(frequencias),key=lambda i: frequencias[i])
+    parcelas,vizinhos=obtem_bytes_campo(m),obtem_funcao_vizinhos(m)
+    tapadas=[i for i,parcela in enumerate(parcelas) if parcela & TAPADA]
+    for i in tapadas:
+        if not any(parcelas[v] & LIMPA for v in vizinhos(i)):
+            return i
+    return tapadas[0]
+
+def primeira_coordenada(m):
+    """
+    Args:
+        m (TAD campo): Campo
+
+    Returns:
+        TAD coordenada: Coordenada no centro do campo, usada na primeira jogada
+    """
+    return cria_coordenada(numero_para_coluna((1+coluna_para_numero(obtem_ultima_coluna(m)))//2),\
+        (1+obtem_ultima_linha(m))//2)
+
+def politica_solucionador(j):
+    """Política de jogo para simulacao.simula: limpa uma parcela segura ou
+    marca uma parcela minada, se alguma for deduzida, e caso contrário
+    limpa a parcela de menor risco.
+
+    Args:
+        j (TAD sessao): Sessão
+
+    Returns:
+        tuple: Ação ("L" ou "M") e coordenada da próxima jogada
+    """
+    m=obtem_campo_sessao(j)
+    if obtem_estado_sessao(j)=="inicio":
+        return "L",primeira_coordenada(m)
+    seguras,minadas,frequencias=deduz(m,obtem_minas_sessao(j))
+    if seguras:
+        return "L",obtem_coordenada_indice(m,min(seguras))
+    if minadas:
+        return "M",obtem_coordenada_indice(m,min(minadas))
+    return "L",obtem_coordenada_indice(m,escolhe_palpite(m,frequencias))
+
+def resolve_sessao(j,palpites=True):
+    """Esta função joga a sessão j até ao fim, aplicando de uma vez todas as
+    jogadas deduzidas em cada passo.
+
+    Args:
+        j (TAD sessao): Sessão
+        palpites (bool): Se False, para quando não houver jogadas deduzidas
+        em vez de arriscar um palpite
+
+    Returns:
+        str: Estado final da sessão
+    """
+    m=obtem_campo_sessao(j)
+    estado=obtem_estado_sessao(j)
+    if estado=="inicio":
+        estado=primeira_jogada(j,primeira_coordenada(m))
+    while estado=="em_curso":
+        seguras,minadas,frequencias=deduz(m,obtem_minas_sessao(j))
+        if not seguras and not minadas:
+            if not palpites:
+                break
+            seguras={escolhe_palpite(m,frequencias)}
+        for i in sorted(minadas):
+            marcar(j,obtem_coordenada_indice(m,i))
+        for i in sorted(seguras):
+            if obtem_bytes_campo(m)[i] & TAPADA and estado=="em_curso":
+                estado=limpar(j,obtem_coordenada_indice(m,i))
+        estado=obtem_estado_sessao(j)
+    return estado
\ No newline at end of file